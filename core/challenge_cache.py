@@ -16,6 +16,11 @@ from filelock import FileLock
 from .types import Challenge
 
 
+def _discovered_at(challenge: Dict[str, Any]) -> str:
+    """Sort key ordering challenges oldest first."""
+    return challenge.get('discovered_at', '')
+
+
 class ChallengeCache:
     """
     Manages JSON-based challenge cache with 24h validity window.
@@ -78,7 +83,7 @@ class ChallengeCache:
             min_time_remaining_hours: Minimum hours until expiry (default: 1.0)
             
         Returns:
-            List of valid challenge dicts
+            List of valid challenge dicts, oldest discovery first
         """
         with self._lock:
             with self._file_lock:
@@ -107,6 +112,8 @@ class ChallengeCache:
                     if latest_submission_local > cutoff:
                         valid.append(c)
                 
+                # Oldest first, the order the mining coordinator works through them
+                valid.sort(key=_discovered_at)
                 logging.debug(f"Found {len(valid)} valid challenges (min {min_time_remaining_hours}h remaining)")
                 return valid
     
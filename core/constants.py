@@ -45,6 +45,17 @@ SOLUTION_RETRY_EXPIRY_HOURS = 24
 # Minimum time between solution retries from persistent storage (hours)
 SOLUTION_RETRY_INTERVAL_HOURS = 1
 
+# Backoff for background solution resubmission: first delay, doubled per
+# failed attempt up to the maximum (seconds)
+SOLUTION_RESUBMIT_BASE_DELAY = 5
+SOLUTION_RESUBMIT_MAX_DELAY = 300
+
+# Flush failed solutions to disk after this many unsaved changes...
+FAILED_SOLUTIONS_FLUSH_BATCH = 32
+
+# ...or after this long (seconds), whichever comes first
+FAILED_SOLUTIONS_FLUSH_INTERVAL = 0.1
+
 # ============================================================================
 # Database Configuration
 # ============================================================================
@@ -90,6 +101,10 @@ GPU_BLOCKS_PER_SM = 0
 # GPU Enabled by default
 GPU_ENABLED = True
 
+# Default jobs kept queued per GPU (config: miner.pipeline_depth), so the
+# next one is waiting when a batch finishes
+GPU_PIPELINE_DEPTH = 2
+
 # Maximum number of workers
 MAX_WORKERS = 1
 
@@ -111,6 +126,10 @@ CPU_MINING_BATCH_SIZE = 2000
 # Default number of CPU workers
 DEFAULT_CPU_WORKERS = 1
 
+# Nonce space per dispatch: each worker walks its own 56-bit counter in steps
+# of this size, so consecutive jobs never overlap (must exceed any batch size)
+NONCE_STRIDE = 1 << 32
+
 # ============================================================================
 # Polling and Update Intervals
 # ============================================================================
@@ -134,8 +153,10 @@ CHALLENGE_REFRESH_FREQUENCY = 10
 # Sleep Durations
 # ============================================================================
 
-# Sleep when all workers are busy (seconds)
-WORKER_BUSY_SLEEP = 0.01
+# Max time to block waiting for a worker response (seconds)
+# The wait returns as soon as a response arrives, so this only bounds how often
+# the mining loop re-checks retries and challenges while workers are busy
+WORKER_RESPONSE_TIMEOUT = 0.5
 
 # Sleep on error in main loops (seconds)
 ERROR_SLEEP_DURATION = 5
@@ -205,11 +226,8 @@ SPINNER_FRAMES = ['|', '/', '-', '\\']
 # Hashrate Smoothing
 # ============================================================================
 
-# Exponential moving average weight for old hashrate values
-HASHRATE_EMA_WEIGHT_OLD = 0.9
-
-# Exponential moving average weight for new hashrate values
-HASHRATE_EMA_WEIGHT_NEW = 0.1
+# Number of recent worker responses averaged into each hashrate figure
+HASHRATE_WINDOW_SAMPLES = 10
 
 # Hashrate display threshold for KH/s vs MH/s
 HASHRATE_MH_THRESHOLD = 1_000_000
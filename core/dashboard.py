@@ -1,4 +1,6 @@
 import os
+import re
+import shutil
 import sys
 import time
 import threading
@@ -18,6 +20,17 @@ BOLD = "\033[1m"
 import subprocess
 import psutil
 
+# Force a full repaint every N frames (recovers from terminal resizes/stray output)
+FULL_REDRAW_INTERVAL = 30
+
+# Matches ANSI escape sequences (zero-width on screen)
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+try:
+    import pynvml  # Optional (nvidia-ml-py): GPU stats without spawning nvidia-smi
+except ImportError:
+    pynvml = None
+
 # Logos
 LOGO_LEGACY = r"""
     _____  _____   _    _     __  __  _____  _   _  ______  _____  
@@ -44,6 +57,38 @@ class SystemMonitor:
         self.gpus = [] # List of dicts: [{'id': 0, 'load': 0.0, 'temp': 0.0}, ...]
         self.last_update = 0
         self.update_interval = 2.0  # Update every 2 seconds
+        self._nvml_handles = None  # NVML device handles, None until initialised
+        self._nvml_failed = pynvml is None
+
+    def _query_gpus_nvml(self):
+        """
+        Read GPU load and temperature in-process via NVML.
+        
+        Returns:
+            List of GPU stat dicts, or None if NVML is unavailable
+        """
+        if self._nvml_failed:
+            return None
+        try:
+            if self._nvml_handles is None:
+                pynvml.nvmlInit()
+                self._nvml_handles = [
+                    pynvml.nvmlDeviceGetHandleByIndex(i)
+                    for i in range(pynvml.nvmlDeviceGetCount())
+                ]
+            
+            gpus = []
+            for i, handle in enumerate(self._nvml_handles):
+                gpus.append({
+                    'id': i,
+                    'load': float(pynvml.nvmlDeviceGetUtilizationRates(handle).gpu),
+                    'temp': float(pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU))
+                })
+            return gpus
+        except Exception:
+            # Fall back to nvidia-smi from now on
+            self._nvml_failed = True
+            return None
 
     def update(self):
         now = time.time()
@@ -105,7 +150,12 @@ class SystemMonitor:
             self.cpu_load = 0.0
             self.cpu_temp = 0.0
 
-        # GPU Stats (nvidia-smi)
+        # GPU Stats (NVML, falling back to nvidia-smi)
+        nvml_gpus = self._query_gpus_nvml()
+        if nvml_gpus is not None:
+            self.gpus = nvml_gpus
+            return
+        
         try:
             # Run nvidia-smi to get load and temp
             # Format: utilization.gpu, temperature.gpu
@@ -179,6 +229,11 @@ class Dashboard:
         # Startup State
         self.startup_complete = False
         self._uptime_reset = False
+        
+        # Last frame written to the terminal (for incremental redraws)
+        self._last_frame_lines = None
+        self._last_frame_columns = None
+        self._frames_since_full_redraw = 0
 
         # Console setup
         os.system('color') # Enable ANSI on Windows
@@ -221,6 +276,53 @@ class Dashboard:
         delta = datetime.now() - self.start_time
         return str(delta).split('.')[0] # Remove microseconds
 
+    def _write_frame(self, buffer):
+        """
+        Write a rendered frame, redrawing only the lines that changed.
+        
+        Frames start with a cursor-home (optionally clear-screen) sequence. When
+        the line count matches the previous frame, only changed lines are
+        rewritten in place; otherwise (and every FULL_REDRAW_INTERVAL frames, to
+        recover from stray output) the whole frame is written. In-place updates
+        address rows by line index, so they are also skipped when the terminal
+        was resized or any line is wider than it and would wrap.
+        """
+        frame = '\n'.join(buffer)
+        lines = frame.split('\n')
+        for prefix in ('\033[H\033[J', '\033[H'):
+            if lines[0].startswith(prefix):
+                lines[0] = lines[0][len(prefix):]
+                break
+        
+        columns = shutil.get_terminal_size().columns
+        # A line's raw length is an upper bound on its visible width, so the
+        # escape codes only need stripping from lines that might be too wide
+        wraps = any(
+            len(line) > columns and len(ANSI_ESCAPE.sub('', line)) > columns
+            for line in lines
+        )
+        
+        last = self._last_frame_lines
+        self._frames_since_full_redraw += 1
+        if (last is None or len(lines) != len(last) or wraps
+                or columns != self._last_frame_columns
+                or self._frames_since_full_redraw >= FULL_REDRAW_INTERVAL):
+            out = frame
+            self._frames_since_full_redraw = 0
+        else:
+            # Move to each changed row, rewrite it and clear any leftover text
+            out = ''.join(
+                f"\033[{row};1H{line}\033[K"
+                for row, (line, old) in enumerate(zip(lines, last), start=1)
+                if line != old
+            )
+        
+        self._last_frame_lines = lines
+        self._last_frame_columns = columns
+        if out:
+            sys.stdout.write(out)
+            sys.stdout.flush()
+
     def render(self):
         # Dispatch based on config
         if config.get('miner.legacy_dashboard', False):
@@ -475,15 +577,12 @@ class Dashboard:
             # Clear rest of screen (to handle shrinking content)
             buffer.append('\033[J')
             
-            sys.stdout.write('\n'.join(buffer))
-            sys.stdout.flush()
+            self._write_frame(buffer)
 
     def _pad_ansi(self, text, width):
         """Pad text to width, ignoring ANSI codes."""
         # Remove ANSI to get visible length
-        import re
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        visible = ansi_escape.sub('', text)
+        visible = ANSI_ESCAPE.sub('', text)
         visible_len = len(visible)
         
         padding = width - visible_len
@@ -611,8 +710,7 @@ class Dashboard:
         buffer.append(f"\n{YELLOW}{BOLD}NOTE:{RESET} First time setup / kernel build may take up to 10 minutes.")
         buffer.append(f"Please be patient if the miner seems stuck on initialization.")
 
-        sys.stdout.write('\n'.join(buffer))
-        sys.stdout.flush()
+        self._write_frame(buffer)
 
     def render_legacy(self):
         # Update system stats (non-blocking check inside)
@@ -679,8 +777,7 @@ class Dashboard:
                 buffer.append(f"{CYAN}└" + "─"*58 + "┘" + f"{RESET}")
                 
                 # Print everything at once
-                sys.stdout.write('\n'.join(buffer))
-                sys.stdout.flush()
+                self._write_frame(buffer)
                 return
 
             # Header
@@ -808,8 +905,7 @@ class Dashboard:
             buffer.append("\nPress Ctrl+C to stop.")
             
             # Print everything at once
-            sys.stdout.write('\n'.join(buffer))
-            sys.stdout.flush()
+            self._write_frame(buffer)
 
 # Global instance
 dashboard = Dashboard()
@@ -3,7 +3,7 @@ import threading
 import json
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Set, Any
+from typing import Optional, Dict, List, Set, Tuple, Any
 
 from .constants import (
     MAX_IN_MEMORY_SOLUTIONS,
@@ -11,7 +11,9 @@ from .constants import (
     MAX_IN_MEMORY_CHALLENGES,
     TRIM_CHALLENGES_TO,
     SOLUTION_RETRY_EXPIRY_HOURS,
-    SOLUTION_RETRY_INTERVAL_HOURS
+    SOLUTION_RETRY_INTERVAL_HOURS,
+    FAILED_SOLUTIONS_FLUSH_BATCH,
+    FAILED_SOLUTIONS_FLUSH_INTERVAL
 )
 from .types import Solution, Challenge, FailedSolution, WalletOptional
 from .exceptions import DatabaseError
@@ -60,10 +62,19 @@ class Database:
         # Failed solutions persistence
         self.failed_solutions_file: Path = Path("failed_solutions.json")
         self.failed_solutions: List[FailedSolution] = []
+        # (challenge_id, nonce) -> entry in failed_solutions, for O(1) lookups
+        self._failed_index: Dict[Tuple[str, str], FailedSolution] = {}
+        self._failed_dirty: int = 0  # Unsaved changes to failed_solutions
+        self._failed_added: int = 0  # New failed solutions not yet logged
+        self._flush_timer: Optional[threading.Timer] = None
+        # Serializes file writes so they land in snapshot order without
+        # holding self.lock during disk I/O
+        self._failed_io_lock: threading.Lock = threading.Lock()
         self._load_failed_solutions()
 
         # Solution totals persistence
         self.solution_totals_file: Path = Path("solution_totals.json")
+        self._totals_io_lock: threading.Lock = threading.Lock()
         self._load_solution_totals()
 
     def _load_failed_solutions(self) -> None:
@@ -85,6 +96,9 @@ class Database:
                     s for s in data 
                     if datetime.fromisoformat(s.get('timestamp', datetime.now().isoformat())) > cutoff
                 ]
+                self._failed_index = {
+                    (s['challenge_id'], s['nonce']): s for s in self.failed_solutions
+                }
                 logging.info(f"Loaded {len(self.failed_solutions)} pending failed solutions")
         except json.JSONDecodeError as e:
             logging.error(f"Invalid JSON in failed solutions file: {e}")
@@ -93,14 +107,71 @@ class Database:
             logging.error(f"Error loading failed solutions: {e}")
             self.failed_solutions = []
 
-    def _save_failed_solutions(self) -> None:
-        """Save failed solutions to disk for persistence across restarts."""
+    def _save_failed_solutions(self, payload: str) -> None:
+        """
+        Save serialized failed solutions to disk for persistence across restarts.
+        
+        Args:
+            payload: JSON document produced from self.failed_solutions
+        """
         try:
             with open(self.failed_solutions_file, 'w', encoding='utf-8') as f:
-                json.dump(self.failed_solutions, f, indent=2)
+                f.write(payload)
         except Exception as e:
             raise DatabaseError(f"Failed to save failed solutions: {e}")
 
+    def _mark_failed_dirty(self) -> None:
+        """
+        Record a change to failed solutions and schedule a batched save.
+        
+        Must be called with self.lock held. The save always runs on a
+        background timer thread, so callers never wait on file I/O: at most
+        FAILED_SOLUTIONS_FLUSH_INTERVAL seconds later, or straight away once
+        FAILED_SOLUTIONS_FLUSH_BATCH changes are pending.
+        """
+        self._failed_dirty += 1
+        delay = FAILED_SOLUTIONS_FLUSH_INTERVAL
+        if self._failed_dirty >= FAILED_SOLUTIONS_FLUSH_BATCH:
+            delay = 0.0
+        
+        timer = self._flush_timer
+        if timer is not None:
+            if timer.interval <= delay:
+                return
+            timer.cancel()  # Batch is full: bring the pending save forward
+        
+        self._flush_timer = threading.Timer(delay, self.flush_failed_solutions)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush_failed_solutions(self) -> None:
+        """
+        Write any pending failed solution changes to disk.
+        
+        The list is serialized under self.lock, but the file write happens
+        after releasing it so other database calls are not blocked on I/O.
+        """
+        with self._failed_io_lock:
+            with self.lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._failed_dirty:
+                    return
+                self._failed_dirty = 0
+                added = self._failed_added
+                self._failed_added = 0
+                payload = json.dumps(self.failed_solutions, separators=(',', ':'))
+            
+            try:
+                self._save_failed_solutions(payload)
+            except DatabaseError as e:
+                logging.error(str(e))
+                return
+            
+            if added:
+                logging.info(f"Persisted {added} failed solution(s) for retry")
+
     def _load_solution_totals(self) -> None:
         """Load persisted solution totals."""
         if not self.solution_totals_file.exists():
@@ -117,14 +188,20 @@ class Database:
             self.total_dev_solutions = 0
 
     def _save_solution_totals(self) -> None:
-        """Persist solution totals to disk."""
+        """
+        Persist solution totals to disk.
+        
+        Called without self.lock held. Writes are serialized and each one reads
+        the counters at write time, so the last write always has the latest totals.
+        """
         try:
-            payload = {
-                'user': self.total_user_solutions,
-                'dev': self.total_dev_solutions
-            }
-            with open(self.solution_totals_file, 'w', encoding='utf-8') as f:
-                json.dump(payload, f, indent=2)
+            with self._totals_io_lock:
+                payload = {
+                    'user': self.total_user_solutions,
+                    'dev': self.total_dev_solutions
+                }
+                with open(self.solution_totals_file, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, indent=2)
         except Exception as exc:
             logging.error(f"Failed to save solution totals: {exc}")
 
@@ -210,27 +287,66 @@ class Database:
             is_dev_solution: Whether this is a dev solution
         """
         with self.lock:
-            solution: Solution = {
-                'challenge_id': challenge_id,
-                'nonce': nonce,
-                'wallet_address': wallet_address,
-                'difficulty': difficulty,
-                'is_dev_solution': is_dev_solution,
-                'timestamp': datetime.now().isoformat(),
-                'status': 'submitted'
-            }
-            self.solutions.append(solution)
-            
-            if is_dev_solution:
-                self.total_dev_solutions += 1
-            else:
-                self.total_user_solutions += 1
-            self._save_solution_totals()
-            
-            # Keep memory usage in check
-            if len(self.solutions) > MAX_IN_MEMORY_SOLUTIONS:
-                self.solutions = self.solutions[-TRIM_SOLUTIONS_TO:]
-                logging.debug(f"Trimmed solutions to {TRIM_SOLUTIONS_TO} entries")
+            self._append_solution(challenge_id, nonce, wallet_address, difficulty, is_dev_solution, 'submitted')
+        self._save_solution_totals()
+
+    def record_accepted_solution(
+        self,
+        challenge_id: str,
+        nonce: str,
+        wallet_address: str,
+        difficulty: str,
+        is_dev_solution: bool = False
+    ) -> None:
+        """
+        Record an accepted solution in a single locked update.
+        
+        Equivalent to mark_challenge_solved() + add_solution() +
+        update_solution_status(..., 'accepted'), but takes the lock once and
+        stores the solution as accepted instead of searching for it again.
+        
+        Args:
+            challenge_id: Challenge identifier
+            nonce: Solution nonce
+            wallet_address: Wallet that found the solution
+            difficulty: Challenge difficulty
+            is_dev_solution: Whether this is a dev solution
+        """
+        with self.lock:
+            self.solved_challenges.setdefault(wallet_address, set()).add(challenge_id)
+            self._append_solution(challenge_id, nonce, wallet_address, difficulty, is_dev_solution, 'accepted')
+        self._save_solution_totals()
+
+    def _append_solution(
+        self,
+        challenge_id: str,
+        nonce: str,
+        wallet_address: str,
+        difficulty: str,
+        is_dev_solution: bool,
+        status: str
+    ) -> None:
+        """Append a solution and bump totals. Must be called with self.lock held."""
+        solution: Solution = {
+            'challenge_id': challenge_id,
+            'nonce': nonce,
+            'wallet_address': wallet_address,
+            'difficulty': difficulty,
+            'is_dev_solution': is_dev_solution,
+            'timestamp': datetime.now().isoformat(),
+            'status': status  # type: ignore
+        }
+        self.solutions.append(solution)
+        
+        if is_dev_solution:
+            self.total_dev_solutions += 1
+        else:
+            self.total_user_solutions += 1
+        
+        # Keep memory usage in check
+        if len(self.solutions) > MAX_IN_MEMORY_SOLUTIONS:
+            self.solutions = self.solutions[-TRIM_SOLUTIONS_TO:]
+            logging.debug(f"Trimmed solutions to {TRIM_SOLUTIONS_TO} entries")
 
     def update_solution_status(self, challenge_id: str, nonce: str, status: str) -> None:
         """
@@ -280,14 +396,18 @@ class Database:
         """
         Get total number of accepted solutions.
         
+        The totals are running counters maintained by _append_solution(), so this is
+        a plain read. It is called every second by the dashboard and does not
+        take the lock: each counter read is atomic, and a dev/user sum that is
+        one solution stale is harmless for display.
+        
         Returns:
             Count of solutions
         """
-        with self.lock:
-            total = self.total_user_solutions
-            if include_dev:
-                total += self.total_dev_solutions
-            return total
+        total = self.total_user_solutions
+        if include_dev:
+            total += self.total_dev_solutions
+        return total
 
     def register_challenge(self, challenge: Challenge) -> None:
         """
@@ -354,9 +474,9 @@ class Database:
         """
         with self.lock:
             # Check if already exists
-            for s in self.failed_solutions:
-                if s['challenge_id'] == challenge_id and s['nonce'] == nonce:
-                    return
+            key = (challenge_id, nonce)
+            if key in self._failed_index:
+                return
 
             entry: FailedSolution = {
                 'wallet_address': wallet_address,
@@ -369,8 +489,13 @@ class Database:
                 'last_retry': None
             }
             self.failed_solutions.append(entry)
-            self._save_failed_solutions()
-            logging.info(f"Persisted failed solution for retry: {challenge_id[:8]}...")
+            self._failed_index[key] = entry
+            self._failed_added += 1  # Logged as one summary per flush
+            self._mark_failed_dirty()
+
+    def has_failed_solutions(self) -> bool:
+        """Check whether any failed solutions are awaiting retry."""
+        return bool(self.failed_solutions)
 
     def get_pending_retries(self) -> List[FailedSolution]:
         """
@@ -405,20 +530,19 @@ class Database:
             success: True if retry succeeded, False otherwise
         """
         with self.lock:
+            entry = self._failed_index.get((challenge_id, nonce))
+            if entry is None:
+                return
+            
             if success:
                 # Remove from failed solutions
-                self.failed_solutions = [
-                    s for s in self.failed_solutions 
-                    if not (s['challenge_id'] == challenge_id and s['nonce'] == nonce)
-                ]
+                del self._failed_index[(challenge_id, nonce)]
+                self.failed_solutions.remove(entry)
             else:
                 # Update retry timestamp
-                for s in self.failed_solutions:
-                    if s['challenge_id'] == challenge_id and s['nonce'] == nonce:
-                        s['last_retry'] = datetime.now().isoformat()
-                        s['retry_count'] = s.get('retry_count', 0) + 1
-                        break
-            self._save_failed_solutions()
+                entry['last_retry'] = datetime.now().isoformat()
+                entry['retry_count'] = entry.get('retry_count', 0) + 1
+            self._mark_failed_dirty()
 
 
 # Global instance
@@ -9,11 +9,18 @@ processing, and mining coordination.
 """
 
 import multiprocessing as mp
+import os
 import threading
 import time
 import logging
 import queue
-from typing import Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pynvml  # Optional (nvidia-ml-py): in-process GPU enumeration
+except ImportError:
+    pynvml = None
 
 from .config import config
 from .networking import api
@@ -26,18 +33,20 @@ from cpu_core.worker import CPUWorker
 from .constants import (
     CHALLENGE_POLL_INTERVAL,
     CHALLENGE_REFRESH_FREQUENCY,
-    WORKER_BUSY_SLEEP,
+    WORKER_RESPONSE_TIMEOUT,
     ERROR_SLEEP_DURATION,
     WAITING_FOR_CHALLENGE_SLEEP,
     WAITING_FOR_CHALLENGE_SLEEP,
     DEV_WALLET_FLOOR,
     GPU_ENABLED,
+    GPU_PIPELINE_DEPTH,
     USE_JSON_WALLET_POOLS
 )
-from .types import Challenge, MineResponse, WorkerType
+from .types import ActiveRequest, Challenge, MineResponse, PoolId, WorkerType
 from .retry_manager import RetryManager
 from .response_processor import ResponseProcessor
 from .mining_coordinator import MiningCoordinator
+from . import mining_utils
 
 
 class MinerManager:
@@ -56,36 +65,53 @@ class MinerManager:
     def __init__(self) -> None:
         """Initialize miner manager with workers and support modules."""
         self.running = False
+        # Set on stop() so sleeping background threads wake immediately
+        self._stop_event = threading.Event()
         
         # GPU workers
         self.gpu_processes = []
         self.gpu_ready_events = []
         self.gpu_ready_flags = []
-        self.gpu_queue: Optional[mp.Queue] = None
-        self.gpu_response_queue: Optional[mp.Queue] = None
+        self.gpu_queues: List[mp.Queue] = []  # One request queue per GPU
         
-        # CPU workers
-        self.cpu_queue = mp.Queue()
-        self.cpu_response_queue = mp.Queue()
+        # CPU workers (queues are created only if CPU mining is enabled)
+        # mp.SimpleQueue: single producer per worker, so no feeder thread is needed
+        self.cpu_queues: List[mp.SimpleQueue] = []  # One request queue per worker
         self.cpu_workers = []
         
+        # Responses from all GPU engines and CPU workers (created on first use)
+        self.response_queue: Optional[mp.Queue] = None
+        
         # Challenge management
-        self.challenge_lock = threading.Lock()
+        # Written only by the poll thread; other threads just read the reference
         self.latest_challenge: Optional[Challenge] = None
+        # Set by the poll thread whenever latest_challenge is replaced
+        self._challenge_updated = threading.Event()
         
         # Support modules (NEW - replaces 338 lines of code!)
         self.retry_manager = RetryManager()
         self.response_processor = ResponseProcessor()
         self.mining_coordinator: Optional[MiningCoordinator] = None
+        # Jobs kept queued per GPU so the next one is waiting when a batch ends
+        self.gpu_pipeline_depth = max(1, int(config.get("miner.pipeline_depth", GPU_PIPELINE_DEPTH)))
         
         # Dashboard state
-        self.current_challenge_id = None
-        self.current_difficulty = None
+        self.current_challenge_id = "Waiting..."
+        self.current_difficulty = "N/A"
         self.active_wallet_count = 0
+        
+        # Background threads (created in start())
+        self.manager_thread: Optional[threading.Thread] = None
+        self.poll_thread: Optional[threading.Thread] = None
+        self.dashboard_thread: Optional[threading.Thread] = None
+        # Wallet pool setup started alongside GPU kernel compilation
+        self._wallet_warmup_thread: Optional[threading.Thread] = None
+        self._wallet_warmup_error: Optional[BaseException] = None
 
     def start(self) -> None:
         """Start the miner with GPU/CPU workers and management threads."""
         self.running = True
+        self._stop_event.clear()
         logging.info("Starting Miner Manager...")
         dashboard.set_loading("Initializing...")
         
@@ -120,6 +146,11 @@ class MinerManager:
             root_logger.removeHandler(h)
 
         gpu_enabled = GPU_ENABLED
+        cpu_enabled = config.get("cpu.enabled")
+        if cpu_enabled:
+            # Reset CPU pool state on startup to clear stuck wallets
+            # (before the wallet warmup can touch the pool)
+            wallet_pool.reset_pool_state("cpu")
 
         # CRITICAL: Start GPU Engines FIRST (if enabled) and wait for them to be ready
         # This prevents CPU resource contention during GPU kernel compilation
@@ -127,16 +158,14 @@ class MinerManager:
             self._start_gpu_engines()
 
         # Start CPU Workers AFTER GPU initialization completes
-        cpu_enabled = config.get("cpu.enabled")
         if cpu_enabled:
-            # Reset CPU pool state on startup to clear stuck wallets
-            wallet_pool.reset_pool_state("cpu")
             self._start_cpu_workers()
         
         # Initialize mining coordinator with queues
         self.mining_coordinator = MiningCoordinator(
-            gpu_queue=self.gpu_queue,
-            cpu_queue=self.cpu_queue
+            gpu_queues=self.gpu_queues,
+            cpu_queues=self.cpu_queues,
+            gpu_pipeline_depth=self.gpu_pipeline_depth
         )
 
         # Start main management threads
@@ -153,19 +182,11 @@ class MinerManager:
         """Start GPU mining engines."""
         try:
             # Detect GPUs
-            import subprocess
-            try:
-                result = subprocess.check_output(['nvidia-smi', '-L'], encoding='utf-8')
-                gpu_count = len(result.strip().split('\n'))
-                logging.info(f"Detected {gpu_count} GPUs")
-            except:
-                logging.warning("Could not detect GPUs via nvidia-smi, assuming 1")
-                gpu_count = 1
+            gpu_count = self._detect_gpu_count()
 
             dashboard.set_loading(f"Initializing {gpu_count} GPUs...")
 
-            self.gpu_queue = mp.Queue()
-            self.gpu_response_queue = mp.Queue()
+            self._ensure_response_queue()
             
             for i in range(gpu_count):
                 # Reset GPU pool state
@@ -176,15 +197,20 @@ class MinerManager:
                 self.gpu_ready_events.append(ready_event)
                 self.gpu_ready_flags.append(ready_flag)
                 
+                # Dedicated request queue: jobs dispatched to GPU i run on GPU i
+                request_queue = mp.Queue()
+                self.gpu_queues.append(request_queue)
+                
                 p = GPUEngine(
-                    self.gpu_queue,
-                    self.gpu_response_queue,
+                    request_queue,
+                    self.response_queue,
                     device_id=i,
                     ready_event=ready_event,
                     ready_flag=ready_flag
                 )
                 p.start()
                 self.gpu_processes.append(p)
+                self._pin_process(p.pid, self._gpu_cpu_affinity(i), f"GPU Engine {i}")
                 logging.info(f"Started GPU Engine {i}")
 
         except Exception as e:
@@ -192,6 +218,18 @@ class MinerManager:
             self.running = False
             return
 
+        # Wallet setup is I/O-bound and independent of the GPUs, so run it
+        # while the kernels compile instead of after
+        if USE_JSON_WALLET_POOLS:
+            num_cpus = config.get("cpu.workers", 1) if config.get("cpu.enabled") else 0
+            self._wallet_warmup_error = None
+            self._wallet_warmup_thread = threading.Thread(
+                target=self._warm_up_wallet_pools,
+                args=(len(self.gpu_processes), num_cpus),
+                daemon=True
+            )
+            self._wallet_warmup_thread.start()
+
         # Wait for GPUs to be ready (compilation can take time)
         logging.info("Waiting for GPU kernels to compile...")
         if not self._wait_for_gpu_ready():
@@ -201,27 +239,129 @@ class MinerManager:
 
         # dashboard.set_loading(None) # Removed: Let dashboard handle transition based on hashrate
     
+    def _detect_gpu_count(self) -> int:
+        """
+        Count available NVIDIA GPUs.
+        
+        Uses NVML in-process when available and only falls back to spawning
+        nvidia-smi if NVML is missing or fails.
+        
+        Returns:
+            Number of GPUs detected (1 if detection fails)
+        """
+        if pynvml is not None:
+            try:
+                pynvml.nvmlInit()
+                gpu_count = pynvml.nvmlDeviceGetCount()
+                logging.info(f"Detected {gpu_count} GPUs")
+                return gpu_count
+            except Exception as e:
+                logging.debug(f"NVML GPU detection failed, trying nvidia-smi: {e}")
+        
+        import subprocess
+        try:
+            result = subprocess.check_output(['nvidia-smi', '-L'], encoding='utf-8')
+            gpu_count = len(result.strip().split('\n'))
+            logging.info(f"Detected {gpu_count} GPUs")
+            return gpu_count
+        except:
+            logging.warning("Could not detect GPUs via nvidia-smi, assuming 1")
+            return 1
+    
+    def _ensure_response_queue(self) -> None:
+        """Create the shared worker response queue if it does not exist yet."""
+        if self.response_queue is None:
+            self.response_queue = mp.Queue()
+    
     def _start_cpu_workers(self) -> None:
         """Start CPU mining workers."""
         num_cpu_workers = config.get("cpu.workers", 1)
         logging.info(f"Starting {num_cpu_workers} CPU workers...")
         
+        self._ensure_response_queue()
+        cpu_cores = self._cpu_worker_cores()
+        
         for i in range(num_cpu_workers):
-            worker = CPUWorker(i, self.cpu_queue, self.cpu_response_queue)
+            request_queue = mp.SimpleQueue()
+            self.cpu_queues.append(request_queue)
+            worker = CPUWorker(i, request_queue, self.response_queue)
             self.cpu_workers.append(worker)
             worker.start()
+            if cpu_cores:
+                self._pin_process(worker.pid, {cpu_cores[i % len(cpu_cores)]}, f"CPU Worker {i}")
             logging.info(f"Started CPU Worker {i}")
+    
+    def _gpu_cpu_affinity(self, device_id: int) -> set[int]:
+        """
+        Get the CPU cores topologically closest to a GPU.
+        
+        Args:
+            device_id: GPU index
+            
+        Returns:
+            Set of usable core ids on the GPU's NUMA node (empty if unknown)
+        """
+        if pynvml is None or not hasattr(os, 'sched_getaffinity'):
+            return set()
+        try:
+            pynvml.nvmlInit()
+            handle = pynvml.nvmlDeviceGetHandleByIndex(device_id)
+            usable = os.sched_getaffinity(0)
+            words = (max(usable) // 64) + 1
+            mask = pynvml.nvmlDeviceGetCpuAffinity(handle, words)
+        except Exception as e:
+            logging.debug(f"Could not query CPU affinity for GPU {device_id}: {e}")
+            return set()
+        
+        cores = {
+            word_index * 64 + bit
+            for word_index, word in enumerate(mask)
+            for bit in range(64)
+            if word >> bit & 1
+        }
+        return cores & usable
+    
+    def _cpu_worker_cores(self) -> List[int]:
+        """
+        Get cores for CPU workers, preferring those not used by GPU engines.
+        
+        Returns:
+            Sorted core ids to assign round-robin (empty if pinning is unsupported)
+        """
+        if not hasattr(os, 'sched_getaffinity'):
+            return []
+        usable = os.sched_getaffinity(0)
+        gpu_cores: set[int] = set()
+        for i in range(len(self.gpu_processes)):
+            gpu_cores |= self._gpu_cpu_affinity(i)
+        free_cores = usable - gpu_cores
+        return sorted(free_cores or usable)
+    
+    def _pin_process(self, pid: Optional[int], cores: set[int], label: str) -> None:
+        """
+        Restrict a child process to a set of CPU cores (best effort).
+        
+        Args:
+            pid: Process id to pin
+            cores: Core ids to allow; nothing is changed when empty
+            label: Name used in log messages
+        """
+        if not pid or not cores or not hasattr(os, 'sched_setaffinity'):
+            return
+        try:
+            os.sched_setaffinity(pid, cores)
+            logging.debug(f"Pinned {label} to cores {sorted(cores)}")
+        except OSError as e:
+            logging.debug(f"Could not pin {label}: {e}")
 
     def stop(self) -> None:
         """Stop all workers and threads gracefully."""
         self.running = False
+        self._stop_event.set()
         
-        if hasattr(self, 'manager_thread'):
-            self.manager_thread.join(timeout=1)
-        if hasattr(self, 'poll_thread'):
-            self.poll_thread.join(timeout=1)
-        if hasattr(self, 'dashboard_thread'):
-            self.dashboard_thread.join(timeout=1)
+        for thread in (self.manager_thread, self.poll_thread, self.dashboard_thread):
+            if thread is not None:
+                thread.join(timeout=1)
 
         # Stop GPU processes
         if self.gpu_processes:
@@ -234,9 +374,15 @@ class MinerManager:
         
         # Stop CPU workers
         if self.cpu_workers:
-            for _ in self.cpu_workers:
+            # The event interrupts a batch in progress; the message wakes a
+            # worker blocked on get(). SimpleQueue.put has no timeout, but it
+            # cannot block here: CPU workers have at most one job queued
+            # (pipeline depth 1), so their pipes never fill up.
+            for p in self.cpu_workers:
+                p.shutdown_event.set()
+            for request_queue in self.cpu_queues:
                 try:
-                    self.cpu_queue.put({'type': 'shutdown'}, timeout=1)
+                    request_queue.put({'type': 'shutdown'})
                 except:
                     pass
             
@@ -249,6 +395,9 @@ class MinerManager:
                     p.terminate()
                     p.join(timeout=0.1)
 
+        # Persist any batched failed-solution changes
+        db.flush_failed_solutions()
+
         logging.info("Miner Manager stopped")
 
     def _poll_challenge_loop(self) -> None:
@@ -261,7 +410,6 @@ class MinerManager:
         - Challenge server provides 24h of challenges, API provides only latest
         - Challenges only change at the top of the hour, so smart sleep is used
         """
-        from datetime import datetime, timedelta
         from .challenge_cache import challenge_cache
         
         # Get server configuration
@@ -278,9 +426,8 @@ class MinerManager:
         while self.running:
             try:
                 # 1. Calculate time to next hour
-                now = datetime.now()
-                next_hour = (now + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
-                seconds_to_next_hour = (next_hour - now).total_seconds()
+                now = time.time()
+                seconds_to_next_hour = 3600 - (int(now) % 3600)
                 
                 # 2. Determine if we should fetch from server
                 should_fetch_from_server = False
@@ -292,7 +439,7 @@ class MinerManager:
                         should_fetch_from_server = True
                         fetch_startup_complete = True
                     # Fetch every hour
-                    elif last_server_fetch is None or (now - last_server_fetch).total_seconds() >= 3600:
+                    elif last_server_fetch is None or now - last_server_fetch >= 3600:
                         should_fetch_from_server = True
                 
                 # 3. Try to fetch from challenge server first
@@ -310,10 +457,10 @@ class MinerManager:
                             challenge_cache.register_challenge(challenge)
                             
                             # Update latest_challenge if this is newer
-                            with self.challenge_lock:
-                                if not self.latest_challenge or challenge.get('challenge_id') != self.latest_challenge.get('challenge_id'):
-                                    self.latest_challenge = challenge
-                                    db.register_challenge(challenge)
+                            if not self.latest_challenge or challenge.get('challenge_id') != self.latest_challenge.get('challenge_id'):
+                                self.latest_challenge = challenge
+                                self._challenge_updated.set()
+                                db.register_challenge(challenge)
                         
                         # Cleanup expired
                         challenge_cache.cleanup_expired()
@@ -325,7 +472,7 @@ class MinerManager:
                 # If we have a challenge AND we are more than 60s away from the hour
                 if self.latest_challenge and seconds_to_next_hour > 60:
                     # Sleep until 45s before the hour (buffer for clock drift/latency)
-                    # But cap sleep at 60s chunks to check self.running frequently
+                    # But cap sleep at 60s so server refreshes are not missed
                     sleep_time = min(seconds_to_next_hour - 45, 60)
                     
                     if sleep_time > 5:
@@ -333,10 +480,9 @@ class MinerManager:
                         if int(seconds_to_next_hour) % 300 < 60:  # Log roughly every 5 mins
                             logging.debug(f"Smart polling: Waiting {int(seconds_to_next_hour)}s for next challenge...")
                         
-                        # Sleep in 1s increments to allow quick shutdown
-                        for _ in range(int(sleep_time)):
-                            if not self.running: return
-                            time.sleep(1)
+                        # Single wait that returns early on shutdown
+                        if self._stop_event.wait(sleep_time):
+                            return
                         continue
 
                 # 5. Poll API (Close to hour mark OR no challenge OR server fetch failed)
@@ -347,21 +493,20 @@ class MinerManager:
                         
                     challenge = api.get_current_challenge()
                     if challenge:
-                        with self.challenge_lock:
-                            # Check if it's actually new
-                            if not self.latest_challenge or self.latest_challenge['challenge_id'] != challenge['challenge_id']:
-                                logging.info(f"New challenge detected from API: {challenge['challenge_id'][:8]}...")
-                                self.latest_challenge = challenge
-                                db.register_challenge(challenge)
-                                challenge_cache.register_challenge(challenge)
+                        # Check if it's actually new
+                        if not self.latest_challenge or self.latest_challenge['challenge_id'] != challenge['challenge_id']:
+                            logging.info(f"New challenge detected from API: {challenge['challenge_id'][:8]}...")
+                            self.latest_challenge = challenge
+                            self._challenge_updated.set()
+                            db.register_challenge(challenge)
+                            challenge_cache.register_challenge(challenge)
                     elif not self.latest_challenge:
                          dashboard.set_loading("Waiting for API response...")
                 
 
                 # Sleep standard interval (e.g. 10s) when actively polling
-                for _ in range(int(CHALLENGE_POLL_INTERVAL)):
-                    if not self.running: return
-                    time.sleep(1)
+                if self._stop_event.wait(CHALLENGE_POLL_INTERVAL):
+                    return
                 
                 # Cleanup expired challenges after each polling cycle
                 # This ensures removal even when server is not being used
@@ -390,11 +535,11 @@ class MinerManager:
                     all_time_sol=all_time,
                     wallet_sols=stats['wallet_solutions'],
                     active_wallets=self.active_wallet_count,
-                    challenge=self.current_challenge_id or "Waiting...",
-                    difficulty=self.current_difficulty or "N/A"
+                    challenge=self.current_challenge_id,
+                    difficulty=self.current_difficulty
                 )
                 dashboard.render()
-                time.sleep(1)
+                self._stop_event.wait(1)
             except Exception as e:
                 logging.error(f"Dashboard error: {e}")
                 time.sleep(ERROR_SLEEP_DURATION)
@@ -451,9 +596,22 @@ class MinerManager:
         use_json_pools = USE_JSON_WALLET_POOLS
         num_gpus = len(self.gpu_processes) if self.gpu_processes else 0
         num_cpus = len(self.cpu_workers) if self.cpu_workers else 0
+        worker_counts: Dict[WorkerType, int] = {'gpu': num_gpus, 'cpu': num_cpus}
         
         if use_json_pools:
-            self._setup_wallet_pools(num_gpus, num_cpus)
+            if self._wallet_warmup_thread is not None:
+                # Already running since the GPU engines were started
+                if self._wallet_warmup_thread.is_alive():
+                    dashboard.set_loading("Generating/Loading Wallets...")
+                self._wallet_warmup_thread.join()
+                self._wallet_warmup_thread = None
+                if self._wallet_warmup_error is not None:
+                    # Don't mine against a half-built wallet pool
+                    logging.error(f"Wallet pool setup failed: {self._wallet_warmup_error}")
+                    self.running = False
+                    raise self._wallet_warmup_error
+            else:
+                self._setup_wallet_pools(num_gpus, num_cpus)
         else:
             # Legacy system (not refactored in this phase)
             from .wallet_manager import wallet_manager
@@ -466,22 +624,33 @@ class MinerManager:
         
         # State tracking
         current_challenge: Optional[Challenge] = None
-        active_requests: Dict[int, Tuple] = {}
-        active_gpu_requests = 0
-        active_cpu_requests = 0
+        active_requests: Dict[int, ActiveRequest] = {}
+        # Requests each worker may have outstanding; GPUs get a queued job
+        # ahead so they don't idle while the manager handles a response.
+        # Each slot mines its own sticky wallet, so queued jobs never repeat
+        # the (wallet, challenge) pair already running on the same GPU.
+        pipeline_depth: Dict[WorkerType, int] = {'gpu': self.gpu_pipeline_depth, 'cpu': 1}
+        all_slots: Dict[WorkerType, int] = {t: (1 << d) - 1 for t, d in pipeline_depth.items()}
+        # Bitmask of occupied pipeline slots per worker
+        busy_slots: Dict[WorkerType, List[int]] = {t: [0] * n for t, n in worker_counts.items()}
+        # Bitmask of workers with a free slot per type (bit i set = worker i can take a job)
+        free_workers: Dict[WorkerType, int] = {t: (1 << n) - 1 for t, n in worker_counts.items()}
         req_id = 0
         
         while self.running:
             try:
                 # 1. Use latest challenge from polling thread (Non-blocking)
                 # REFACTORED: Removed blocking api.get_current_challenge() call
-                latest_challenge = None
-                with self.challenge_lock:
-                    latest_challenge = self.latest_challenge
+                # Lock-free read: the poll thread only ever swaps the reference,
+                # and a single attribute load is atomic
+                latest_challenge = self.latest_challenge
 
                 if latest_challenge:
                     from .challenge_cache import challenge_cache
-                    challenge_cache.register_challenge(latest_challenge)
+                    # Only touch the cache file when the poll thread swapped in a new challenge
+                    if self._challenge_updated.is_set():
+                        self._challenge_updated.clear()
+                        challenge_cache.register_challenge(self.latest_challenge)
                     
                     # Periodically cleanup expired challenges (every 10 requests instead of 100)
                     # This ensures expired challenges are removed promptly
@@ -509,104 +678,160 @@ class MinerManager:
                     self.current_challenge_id = "Waiting..."
                 if valid_challenges:
                     # Show difficulty of easiest challenge
-                    easiest = min(valid_challenges, key=lambda c: int(c['difficulty'], 16))
+                    easiest = min(valid_challenges, key=mining_utils.challenge_difficulty)
                     self.current_difficulty = easiest['difficulty'][:10]
                 
                 # 3. Get cached ROM keys for optimization
                 cached_rom_keys = self._get_cached_rom_keys()
                 
-                # 4. Dispatch GPU jobs
-                if self.retry_manager.get_queue_size() > 0:
-                    self.retry_manager.process_immediate_retries(
-                        on_success=self._on_retry_success,
-                        on_fatal=self._on_retry_fatal,
-                        on_transient=self._on_retry_transient
-                    )
-                
-                # 2b. Load persistent retries
-                self.retry_manager.load_persistent_retries(req_id)
-                
-                # 5. Dispatch GPU jobs
-                while self.mining_coordinator.can_dispatch_gpu(num_gpus, active_gpu_requests):
-                    if not self.running:
-                        break
+                # 4. Process retries (skipped entirely when nothing is pending)
+                if self.retry_manager.has_pending():
+                    if self.retry_manager.get_queue_size() > 0:
+                        self.retry_manager.process_immediate_retries(
+                            on_success=self._on_retry_success,
+                            on_fatal=self._on_retry_fatal,
+                            on_transient=self._on_retry_transient
+                        )
                     
-                    gpu_id = req_id % num_gpus
-                    use_dev = dev_fee_manager.should_use_dev_wallet()
-                    
-                    req_id += 1
-                    result = self.mining_coordinator.dispatch_job(
-                        worker_type='gpu',
-                        worker_id=gpu_id,
-                        available_challenges=valid_challenges,
-                        req_id=req_id,
-                        use_dev_wallet=use_dev,
-                        cached_rom_keys=cached_rom_keys
-                    )
-                    
-                    if result:
-                        wallet, challenge_id, is_dev = result
-                        active_requests[req_id] = ('gpu', gpu_id, wallet['address'], challenge_id, is_dev)
-                        active_gpu_requests += 1
-                    else:
-                        break
+                    # 2b. Load persistent retries
+                    self.retry_manager.load_persistent_retries(req_id)
                 
-                # 6. Dispatch CPU jobs
-                free_cpu_id = self.mining_coordinator.can_dispatch_cpu(num_cpus, active_requests)
-                while free_cpu_id is not None:
-                    if not self.running:
-                        break
-                    
-                    use_dev = dev_fee_manager.should_use_dev_wallet()
-                    
-                    req_id += 1
-                    result = self.mining_coordinator.dispatch_job(
-                        worker_type='cpu',
-                        worker_id=free_cpu_id,
-                        available_challenges=valid_challenges,
-                        req_id=req_id,
-                        use_dev_wallet=use_dev,
-                        cached_rom_keys=cached_rom_keys
+                # 5. Dispatch jobs to free GPU and CPU workers (GPUs first)
+                for worker_type in worker_counts:
+                    req_id = self._dispatch_free_workers(
+                        worker_type,
+                        free_workers,
+                        busy_slots[worker_type],
+                        all_slots[worker_type],
+                        active_requests,
+                        valid_challenges,
+                        cached_rom_keys,
+                        req_id
                     )
-                    
-                    if result:
-                        wallet, challenge_id, is_dev = result
-                        active_requests[req_id] = ('cpu', free_cpu_id, wallet['address'], challenge_id, is_dev)
-                        active_cpu_requests += 1
-                        free_cpu_id = self.mining_coordinator.can_dispatch_cpu(num_cpus, active_requests)
-                    else:
-                        break
                 
-                # 7. Check for GPU responses (Drain queue)
-                try:
-                    while True:
-                        response = self.gpu_response_queue.get_nowait()
-                        self._handle_response(response, active_requests, valid_challenges[0] if valid_challenges else {}, num_gpus)
-                        active_gpu_requests -= 1
-                except queue.Empty:
-                    pass
+                # 7. Handle worker responses (Drain queue)
+                # Dispatch above stops only once every slot is full or no wallet
+                # could be allocated; either way nothing changes until a worker
+                # responds, so block for the next response instead of spinning.
+                # Immediate retries are handled one per loop, so don't block
+                # while any are queued or they would be capped by the timeout.
+                retries_queued = self.retry_manager.get_queue_size() > 0
+                if self.response_queue is None:
+                    if not retries_queued:
+                        time.sleep(WORKER_RESPONSE_TIMEOUT)
+                    continue
                 
-                # 8. Check for CPU responses (Drain queue)
                 try:
+                    if retries_queued:
+                        response = self.response_queue.get_nowait()
+                    else:
+                        response = self.response_queue.get(timeout=WORKER_RESPONSE_TIMEOUT)
                     while True:
-                        response = self.cpu_response_queue.get_nowait()
-                        self._handle_response(response, active_requests, valid_challenges[0] if valid_challenges else {}, num_cpus)
-                        active_cpu_requests -= 1
+                        finished = self._handle_response(
+                            response,
+                            active_requests,
+                            valid_challenges[0] if valid_challenges else {},
+                            worker_counts
+                        )
+                        if finished:
+                            worker_type, worker_id, slot = finished
+                            busy_slots[worker_type][worker_id] &= ~(1 << slot)
+                            free_workers[worker_type] |= 1 << worker_id
+                        response = self.response_queue.get_nowait()
                 except queue.Empty:
                     pass
                 
-                # Sleep if all workers busy
-                if active_gpu_requests == num_gpus and active_cpu_requests == num_cpus:
-                    time.sleep(WORKER_BUSY_SLEEP)
-                
             except Exception as e:
                 logging.error(f"Mining loop error: {e}")
                 time.sleep(ERROR_SLEEP_DURATION)
     
-    def _setup_wallet_pools(self, num_gpus: int, num_cpus: int) -> None:
+    def _dispatch_free_workers(
+        self,
+        worker_type: WorkerType,
+        free_workers: Dict[WorkerType, int],
+        busy_slots: List[int],
+        all_slots: int,
+        active_requests: Dict[int, ActiveRequest],
+        valid_challenges: List[Challenge],
+        cached_rom_keys: frozenset[str],
+        req_id: int
+    ) -> int:
+        """
+        Dispatch jobs to every free worker of one type.
+        
+        A worker whose dispatch fails (no wallet could be allocated or
+        created) is skipped for the rest of this tick, so the other workers,
+        which have their own wallet pools, still get work.
+        
+        Args:
+            worker_type: 'gpu' or 'cpu'
+            free_workers: Bitmask per type of workers with a free slot (updated)
+            busy_slots: Occupied pipeline slot bitmask per worker (updated)
+            all_slots: Bitmask of a worker with every pipeline slot occupied
+            active_requests: Dictionary of in-flight requests (updated)
+            valid_challenges: Challenges available for dispatch
+            cached_rom_keys: ROM keys currently cached by the GPUs
+            req_id: Last request ID used
+            
+        Returns:
+            Last request ID used after dispatching
+        """
+        # Workers still to try this tick
+        candidates = free_workers[worker_type]
+        while candidates and self.running:
+            # Lowest candidate worker ID (lowest set bit)
+            worker_bit = candidates & -candidates
+            worker_id = worker_bit.bit_length() - 1
+            # Lowest free pipeline slot (lowest clear bit)
+            busy = busy_slots[worker_id]
+            slot = ((busy + 1) & ~busy).bit_length() - 1
+            use_dev = dev_fee_manager.should_use_dev_wallet()
+            
+            req_id += 1
+            result = self.mining_coordinator.dispatch_job(
+                worker_type=worker_type,
+                worker_id=worker_id,
+                available_challenges=valid_challenges,
+                req_id=req_id,
+                use_dev_wallet=use_dev,
+                cached_rom_keys=cached_rom_keys,
+                slot=slot
+            )
+            
+            if not result:
+                # Try the next worker; this one is retried on the next tick
+                candidates &= ~worker_bit
+                continue
+            
+            wallet, challenge_id, is_dev = result
+            active_requests[req_id] = ActiveRequest(
+                worker_type, worker_id, wallet['address'], challenge_id, is_dev, slot
+            )
+            busy |= 1 << slot
+            busy_slots[worker_id] = busy
+            if busy == all_slots:
+                free_workers[worker_type] &= ~worker_bit
+                candidates &= ~worker_bit
+        
+        return req_id
+    
+    def _warm_up_wallet_pools(self, num_gpus: int, num_cpus: int) -> None:
+        """
+        Set up wallet pools in the background while GPU kernels compile.
+        
+        Any error is kept for _manage_mining to report when it joins this
+        thread. The dashboard's loading message is left to the GPU startup.
+        """
+        try:
+            self._setup_wallet_pools(num_gpus, num_cpus, show_loading=False)
+        except BaseException as e:
+            self._wallet_warmup_error = e
+    
+    def _setup_wallet_pools(self, num_gpus: int, num_cpus: int, show_loading: bool = True) -> None:
         """Setup JSON-based per-GPU wallet pools."""
         logging.info("Using JSON-based per-GPU wallet pools")
-        dashboard.set_loading("Generating/Loading Wallets...")
+        if show_loading:
+            dashboard.set_loading("Generating/Loading Wallets...")
         
         # Migrate existing DB wallets
         try:
@@ -624,55 +849,77 @@ class MinerManager:
         dev_wallet_target = max(DEV_WALLET_FLOOR, max(1, wallets_per_gpu // 4))
         logging.info(f"Ensuring {wallets_per_gpu} wallets per GPU...")
         
-        for gpu_id in range(num_gpus):
-            wallet_pool.ensure_wallets(gpu_id, wallets_per_gpu)
-            wallet_pool.ensure_dev_wallets(gpu_id, dev_wallet_target)
-            wallet_pool.start_consolidation_thread(gpu_id)
-            stats = wallet_pool.get_pool_stats(gpu_id)
-            logging.info(
-                f"GPU {gpu_id}: {stats['total']} user wallets ({stats['available']} available) | "
-                f"{stats['dev_total']} dev wallets ({stats['dev_available']} available)"
-            )
-        
-        # Ensure CPU wallets (single shared pool for all workers)
+        pool_ids: List[PoolId] = list(range(num_gpus))
         if num_cpus > 0:
+            # Single shared pool for all CPU workers
             logging.info(f"Creating shared wallet pool for {num_cpus} CPU workers...")
-            pool_id = "cpu"
-            wallet_pool.ensure_wallets(pool_id, wallets_per_gpu)
-            wallet_pool.ensure_dev_wallets(pool_id, dev_wallet_target)
-            wallet_pool.start_consolidation_thread(pool_id)
-            stats = wallet_pool.get_pool_stats(pool_id)
-            logging.info(
-                f"CPU Pool: {stats['total']} user wallets ({stats['available']} available) | "
-                f"{stats['dev_total']} dev wallets ({stats['dev_available']} available)"
-            )
+            pool_ids.append("cpu")
+        
+        # Pools live in separate files with their own locks, so they can be
+        # filled concurrently instead of one after another.
+        with ThreadPoolExecutor(max_workers=max(1, len(pool_ids))) as executor:
+            futures = [
+                executor.submit(self._setup_wallet_pool, pool_id, wallets_per_gpu, dev_wallet_target)
+                for pool_id in pool_ids
+            ]
+            for future in futures:
+                future.result()
         
         time.sleep(2)  # Brief pause for API rate limits
     
-    def _get_cached_rom_keys(self) -> set[str]:
+    def _setup_wallet_pool(self, pool_id: PoolId, wallet_count: int, dev_wallet_target: int) -> None:
+        """
+        Fill a single wallet pool and start its consolidation thread.
+        
+        Args:
+            pool_id: GPU index or "cpu"
+            wallet_count: Minimum number of user wallets
+            dev_wallet_target: Minimum number of dev wallets
+        """
+        wallet_pool.ensure_wallets(pool_id, wallet_count)
+        wallet_pool.ensure_dev_wallets(pool_id, dev_wallet_target)
+        wallet_pool.start_consolidation_thread(pool_id)
+        stats = wallet_pool.get_pool_stats(pool_id)
+        label = "CPU Pool" if pool_id == "cpu" else f"GPU {pool_id}"
+        logging.info(
+            f"{label}: {stats['total']} user wallets ({stats['available']} available) | "
+            f"{stats['dev_total']} dev wallets ({stats['dev_available']} available)"
+        )
+    
+    def _get_cached_rom_keys(self) -> frozenset[str]:
         """
         Get ROM keys currently tracked by mining coordinator.
         
         Returns:
-            Set of ROM keys recently used (for cache optimization)
+            Read-only set of ROM keys recently used (for cache optimization)
         """
-        if hasattr(self.mining_coordinator, 'recent_rom_keys'):
-            return self.mining_coordinator.recent_rom_keys.copy()
-        return set()
+        return self.mining_coordinator.get_rom_keys_snapshot()
     
     def _handle_response(
         self,
         response: MineResponse,
-        active_requests: Dict[int, Tuple],
+        active_requests: Dict[int, ActiveRequest],
         current_challenge: Challenge,
-        num_workers: int
-    ) -> None:
-        """Handle a worker response using ResponseProcessor."""
-        resp_id = response.get('request_id')
-        if resp_id not in active_requests:
-            return
+        worker_counts: Dict[WorkerType, int]
+    ) -> Optional[Tuple[WorkerType, int, int]]:
+        """
+        Handle a worker response using ResponseProcessor.
+        
+        Args:
+            response: Response dictionary from a GPU engine or CPU worker
+            active_requests: Dictionary of in-flight requests
+            current_challenge: Current challenge object
+            worker_counts: Number of workers per worker type
+            
+        Returns:
+            (worker_type, worker_id, slot) of the pipeline slot that finished,
+            or None for unknown requests
+        """
+        request_info = active_requests.pop(response.get('request_id'), None)
+        if request_info is None:
+            return None
         
-        worker_type, worker_id, wallet_addr, challenge_id, is_dev = active_requests.pop(resp_id)
+        worker_type, worker_id, wallet_addr, challenge_id, is_dev, slot = request_info
         
         self.response_processor.process_response(
             response=response,
@@ -682,7 +929,7 @@ class MinerManager:
             challenge_id=challenge_id,
             is_dev_solution=is_dev,
             current_challenge=current_challenge,
-            num_workers=num_workers,
+            num_workers=worker_counts[worker_type],
             keep_wallet_on_fail=True  # Keep wallets sticky for all workers (GPU and CPU)
         )
         
@@ -691,10 +938,11 @@ class MinerManager:
             # Register solution on dashboard
             dashboard.register_solution(worker_type, worker_id, challenge_id, wallet_addr)
             
-            if worker_type == 'cpu':
-                self.mining_coordinator.clear_sticky_wallet(worker_id, 'cpu')
-            elif worker_type == 'gpu':
-                self.mining_coordinator.clear_sticky_wallet(worker_id, 'gpu')
+            # Only if it is still this wallet: a late response must not drop
+            # the sticky wallet already handed to the worker's next job
+            self.mining_coordinator.clear_sticky_wallet(worker_id, worker_type, slot, address=wallet_addr)
+        
+        return worker_type, worker_id, slot
 
     def _on_retry_success(
         self,
@@ -704,12 +952,7 @@ class MinerManager:
         is_dev: bool
     ) -> None:
         """Callback for successful retry."""
-        if is_dev:
-            self.response_processor.dev_session_solutions += 1
-        else:
-            self.response_processor.session_solutions += 1
-            if wallet_addr in self.response_processor.wallet_session_solutions:
-                self.response_processor.wallet_session_solutions[wallet_addr] += 1
+        self.response_processor.record_solution(wallet_addr, is_dev)
         
         # Update dashboard status
         dashboard.register_solution("MANAGER", "RETRY", challenge_id, wallet_addr)
@@ -736,5 +979,17 @@ class MinerManager:
         pass  # Already re-queued in RetryManager
 
 
-# Global instance
-miner_manager = MinerManager()
+# Global instance (created on first access, so importing this module for
+# MinerManager alone, as main.py does, doesn't build an unused manager)
+_miner_manager: Optional[MinerManager] = None
+
+
+def __getattr__(name: str) -> MinerManager:
+    """Lazily create the module-level ``miner_manager`` instance."""
+    global _miner_manager
+    if name == 'miner_manager':
+        if _miner_manager is None:
+            _miner_manager = MinerManager()
+        return _miner_manager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
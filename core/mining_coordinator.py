@@ -5,14 +5,22 @@ Coordinates job dispatch to GPU and CPU workers, handling wallet allocation,
 request building, and worker job queueing.
 """
 
+import itertools
 import logging
-from typing import Optional, Dict
+from typing import Iterable, Optional, Dict, List
 import multiprocessing as mp
 
 from .wallet_pool import wallet_pool
+from .constants import NONCE_STRIDE
 from .types import Challenge, WalletOptional, MineRequest, WorkerType, PoolId
 from . import mining_utils
 
+# Low 56 bits of a start nonce hold the per-worker counter
+_NONCE_COUNTER_MASK = (1 << 56) - 1
+
+# Number of recently dispatched ROM keys to remember
+_RECENT_ROM_KEYS = 10
+
 
 class MiningCoordinator:
     """
@@ -25,27 +33,53 @@ class MiningCoordinator:
     - Logging mining status
     """
     
+    __slots__ = (
+        'gpu_queues', 'cpu_queues', 'gpu_pipeline_depth', 'last_logged_combos',
+        'gpu_sticky_wallets', 'cpu_sticky_wallets', 'cpu_pending_dev_fee',
+        'recent_rom_keys', '_rom_keys_version', '_snapshot_version',
+        '_rom_keys_snapshot', '_nonce_counters'
+    )
+    
     def __init__(
         self,
-        gpu_queue: Optional[mp.Queue] = None,
-        cpu_queue: Optional[mp.Queue] = None
+        gpu_queues: Optional[List[mp.Queue]] = None,
+        cpu_queues: Optional[List[mp.SimpleQueue]] = None,
+        gpu_pipeline_depth: int = 1
     ) -> None:
         """
         Initialize mining coordinator.
         
         Args:
-            gpu_queue: Queue for GPU mining requests
-            cpu_queue: Queue for CPU mining requests
+            gpu_queues: Per-GPU request queues, indexed by device ID
+            cpu_queues: Per-worker CPU request queues, indexed by worker ID
+            gpu_pipeline_depth: Jobs each GPU may have queued (pipeline slots)
         """
-        self.gpu_queue = gpu_queue
-        self.cpu_queue = cpu_queue
-        self.last_logged_combos: Dict[str, tuple] = {}
-        # Track sticky wallets for GPU workers: worker_id -> wallet_address
-        self.gpu_sticky_wallets: Dict[int, str] = {}
+        self.gpu_queues = gpu_queues or []
+        self.cpu_queues = cpu_queues or []
+        self.gpu_pipeline_depth = max(1, gpu_pipeline_depth)
+        # Last logged (challenge_id, address) per worker, one entry per worker
+        # ID (per worker ID and pipeline slot for GPUs)
+        self.last_logged_combos: Dict[WorkerType, List[Optional[tuple]]] = {
+            'gpu': [None] * (len(self.gpu_queues) * self.gpu_pipeline_depth),
+            'cpu': [None] * len(self.cpu_queues)
+        }
+        # Track sticky wallets for GPU workers: (worker_id, slot) -> wallet_address
+        # Each pipeline slot keeps its own wallet, so a queued job never
+        # repeats the (wallet, challenge) pair already running on that GPU
+        self.gpu_sticky_wallets: Dict[tuple[int, int], str] = {}
         # Track sticky wallets for CPU workers: worker_id -> wallet_address
         self.cpu_sticky_wallets: Dict[int, str] = {}
         # Track deferred dev-fee assignments for CPU workers
         self.cpu_pending_dev_fee: Dict[int, bool] = {}
+        # ROM keys recently dispatched (insertion-ordered dict used as an
+        # ordered set, oldest first), plus a read-only snapshot that is only
+        # rebuilt when it changes (avoids a set copy per coordinator tick)
+        self.recent_rom_keys: Dict[str, None] = {}
+        self._rom_keys_version = 0
+        self._snapshot_version = 0
+        self._rom_keys_snapshot: frozenset[str] = frozenset()
+        # Per-worker nonce counters (low 56 bits), seeded randomly on first use
+        self._nonce_counters: Dict[tuple, int] = {}
     
     def dispatch_job(
         self,
@@ -54,7 +88,8 @@ class MiningCoordinator:
         available_challenges: list[Challenge],
         req_id: int,
         use_dev_wallet: bool = False,
-        cached_rom_keys: Optional[set[str]] = None
+        cached_rom_keys: Optional[frozenset[str]] = None,
+        slot: int = 0
     ) -> Optional[tuple[WalletOptional, str, bool]]:
         """
         Dispatch a mining job to a worker.
@@ -66,6 +101,7 @@ class MiningCoordinator:
             req_id: Request ID for tracking
             use_dev_wallet: Whether to use a dev wallet for this job
             cached_rom_keys: Set of ROM keys currently cached in GPU memory
+            slot: GPU pipeline slot the job is queued in (always 0 for CPUs)
             
         Returns:
             Tuple of (wallet, challenge_id, is_dev_solution) if job dispatched,
@@ -74,8 +110,7 @@ class MiningCoordinator:
         # All CPU workers share a single "cpu" pool, GPU workers each get their own pool
         pool_id: PoolId = "cpu" if worker_type == 'cpu' else worker_id
         
-        # Check for sticky wallet (CPU only)
-        sticky_address = None
+        # Get sticky address if this worker already has one (single lookup)
         desired_dev_wallet = use_dev_wallet
         if worker_type == 'cpu':
             sticky_address = self.cpu_sticky_wallets.get(worker_id)
@@ -85,68 +120,84 @@ class MiningCoordinator:
                 # Can't swap wallets mid-stream; defer dev fee until wallet rotates
                 self.cpu_pending_dev_fee[worker_id] = True
                 desired_dev_wallet = False
-            
-        # Select wallet first (without challenge assignment yet)
-        # Get sticky address if this worker already has one
-        sticky_address = None
-        if not desired_dev_wallet:
-            if worker_type == 'gpu':
-                sticky_address = self.gpu_sticky_wallets.get(worker_id)
-            elif worker_type == 'cpu':
-                sticky_address = self.cpu_sticky_wallets.get(worker_id)
+        else:
+            sticky_address = None if desired_dev_wallet else self.gpu_sticky_wallets.get((worker_id, slot))
         
         # SMART CHALLENGE SELECTION: Minimize wallet creation
         if not available_challenges:
             return None
         
-        # Sort challenges by discovery time (oldest first) for normal operation
-        # Challenges have 'discovered_at' field from challenge_cache
-        available_challenges.sort(key=lambda c: c.get('discovered_at', ''))
+        # Challenges arrive oldest first (challenge_cache sorts them by
+        # 'discovered_at' once per tick), so no per-dispatch sort is needed
+        
+        # Parse each challenge's difficulty once for this dispatch
+        difficulties = list(map(mining_utils.challenge_difficulty, available_challenges))
         
         # Detect difficulty spike: newest challenge harder than oldest?
-        oldest_difficulty = int(available_challenges[0]['difficulty'], 16)
-        newest_difficulty = int(available_challenges[-1]['difficulty'], 16)
-        difficulty_increased = newest_difficulty > oldest_difficulty
+        oldest_difficulty = difficulties[0]
+        difficulty_increased = difficulties[-1] > oldest_difficulty
         
         # Reorder challenges for difficulty spike mode
+        candidates: Iterable[Challenge] = available_challenges
         if difficulty_increased:
             # DIFFICULTY SPIKE MODE: Prioritize clearing all lower-difficulty challenges
             # This allows creating new wallets to quickly finish easier challenges
-            # before they expire
-            lower_diff_challenges = [
-                c for c in available_challenges 
-                if int(c['difficulty'], 16) == oldest_difficulty
-            ]
-            higher_diff_challenges = [
-                c for c in available_challenges 
-                if int(c['difficulty'], 16) != oldest_difficulty
-            ]
-            if lower_diff_challenges:
-                # Prioritize lower difficulty first, then higher
-                available_challenges = lower_diff_challenges + higher_diff_challenges
-                logging.debug(f"Difficulty spike detected - prioritizing lower difficulty challenges")
+            # before they expire. The order is produced lazily: the caller's list
+            # is shared by every dispatch in this tick so it is never modified.
+            candidates = itertools.chain(
+                (c for c, d in zip(available_challenges, difficulties) if d == oldest_difficulty),
+                (c for c, d in zip(available_challenges, difficulties) if d != oldest_difficulty)
+            )
+            logging.debug("Difficulty spike detected - prioritizing lower difficulty challenges")
         
         # WALLET REUSE FIX: Try all challenges before creating new wallet
-        # Loop through challenges to find one where an existing wallet is available
+        # Search the candidates for one where an existing wallet is available
         wallet = None
         selected_challenge = None
         
-        for challenge in available_challenges:
-            wallet, is_dev = self._select_wallet(
-                pool_id,
-                challenge,
-                desired_dev_wallet,
-                sticky_address,
-                worker_id,
-                allow_creation=False  # Don't create yet, just try existing wallets
-            )
-            if wallet:
-                selected_challenge = challenge
+        is_dev = desired_dev_wallet
+        
+        # The sticky wallet is the same for every candidate, so look it up once
+        sticky_wallet = None
+        solved_challenges: frozenset[str] = frozenset()
+        if sticky_address:
+            sticky_wallet = wallet_pool.get_wallet(pool_id, sticky_address)
+            if sticky_wallet:
+                solved_challenges = frozenset(sticky_wallet.get('solved_challenges', ()))
+            else:
+                logging.warning("Sticky wallet %s not found via get_wallet", sticky_address[:8])
+        
+        # Single pass over the candidates: collect the challenges ahead of the
+        # first one the sticky wallet has not solved yet
+        candidate_ids = []
+        sticky_challenge = None
+        for challenge in candidates:
+            if sticky_wallet and challenge['challenge_id'] not in solved_challenges:
+                sticky_challenge = challenge
                 break
+            candidate_ids.append(challenge['challenge_id'])
+        
+        # Challenges ahead of the sticky one get a pooled wallet first; all of
+        # them are searched under a single pool lock. Don't create yet.
+        allocated = wallet_pool.allocate_wallet_any(
+            pool_id, candidate_ids, require_dev=desired_dev_wallet
+        )
+        if allocated:
+            wallet, challenge_id = allocated
+            selected_challenge = next(c for c in available_challenges if c['challenge_id'] == challenge_id)
+        elif sticky_challenge is not None:
+            # Sticky wallet can be reused for this challenge
+            selected_challenge = sticky_challenge
+            challenge_id = selected_challenge['challenge_id']
+            if sticky_wallet.get('current_challenge') != challenge_id:
+                wallet_pool.reuse_wallet(pool_id, sticky_address, challenge_id)
+                sticky_wallet['current_challenge'] = challenge_id
+            wallet = sticky_wallet
         
         # Only create new wallet if no existing wallet available for ANY challenge
         if not wallet:
-            # Use oldest challenge for new wallet creation
+            # Use oldest challenge for new wallet creation (it also heads the
+            # spike-mode order, since the lower bucket is its difficulty)
             selected_challenge = available_challenges[0]
             wallet, is_dev = self._select_wallet(
                 pool_id,
@@ -164,14 +215,19 @@ class MiningCoordinator:
             
         # Update sticky tracking for workers
         if worker_type == 'gpu' and not is_dev:
-            # Track sticky wallet for GPU
-            if worker_id not in self.gpu_sticky_wallets:
-                 logging.debug(f"Coordinator: Assigned sticky wallet {wallet['address'][:8]} to GPU {worker_id}")
-            self.gpu_sticky_wallets[worker_id] = wallet['address']
+            # Track sticky wallet for GPU pipeline slot
+            if (worker_id, slot) not in self.gpu_sticky_wallets:
+                 logging.debug(
+                     "Coordinator: Assigned sticky wallet %s to GPU %s slot %s",
+                     wallet['address'][:8], worker_id, slot
+                 )
+            self.gpu_sticky_wallets[(worker_id, slot)] = wallet['address']
         elif worker_type == 'cpu' and not is_dev:
             # Track sticky wallet for CPU
             if worker_id not in self.cpu_sticky_wallets:
-                 logging.info(f"Coordinator: Assigned sticky wallet {wallet['address'][:8]} to CPU worker {worker_id}")
+                 logging.info(
+                     "Coordinator: Assigned sticky wallet %s to CPU worker %s", wallet['address'][:8], worker_id
+                 )
             self.cpu_sticky_wallets[worker_id] = wallet['address']
             if not desired_dev_wallet and worker_id in self.cpu_pending_dev_fee and not self.cpu_pending_dev_fee[worker_id]:
                 self.cpu_pending_dev_fee.pop(worker_id, None)
@@ -183,7 +239,7 @@ class MiningCoordinator:
             self.cpu_pending_dev_fee[worker_id] = True
         
         # Log new mining combination
-        self._log_mining_start(worker_type, worker_id, pool_id, challenge, wallet)
+        self._log_mining_start(worker_type, worker_id, pool_id, challenge, wallet, slot)
         
         # Build and queue request
         # CPU uses full 256-bit difficulty, GPU uses first 32 bits for performance
@@ -191,23 +247,42 @@ class MiningCoordinator:
             req_id=req_id,
             wallet=wallet,
             challenge=challenge,
+            start_nonce=self._next_start_nonce(worker_type, worker_id),
             full_difficulty=False # CPU now uses 32-bit difficulty same as GPU
         )
         
-        # Send to appropriate queue
-        queue = self.cpu_queue if worker_type == 'cpu' else self.gpu_queue
-        if queue:
-            queue.put(request)
+        # Send to the worker's own queue so the job runs where it is tracked
+        queues = self.cpu_queues if worker_type == 'cpu' else self.gpu_queues
+        if worker_id < len(queues):
+            queues[worker_id].put(request)
         
         # Track ROM usage for cache optimization
-        if not hasattr(self, 'recent_rom_keys'):
-            self.recent_rom_keys = set()
-        self.recent_rom_keys.add(challenge['no_pre_mine'])
-        if len(self.recent_rom_keys) > 10:  # Keep last 10
-            self.recent_rom_keys = set(list(self.recent_rom_keys)[-10:])
+        self.add_rom_key(challenge['no_pre_mine'])
         
         return (wallet, challenge['challenge_id'], is_dev)
     
+    def add_rom_key(self, rom_key: str) -> None:
+        """Record a dispatched ROM key, invalidating the snapshot only on change."""
+        if rom_key in self.recent_rom_keys:
+            return
+        self.recent_rom_keys[rom_key] = None
+        if len(self.recent_rom_keys) > _RECENT_ROM_KEYS:
+            # Evict the oldest key
+            del self.recent_rom_keys[next(iter(self.recent_rom_keys))]
+        self._rom_keys_version += 1
+    
+    def get_rom_keys_snapshot(self) -> frozenset[str]:
+        """
+        Get a read-only view of the recently used ROM keys.
+        
+        Returns:
+            Frozenset of ROM keys, rebuilt only when the underlying set changed
+        """
+        if self._rom_keys_version != self._snapshot_version:
+            self._rom_keys_snapshot = frozenset(self.recent_rom_keys)
+            self._snapshot_version = self._rom_keys_version
+        return self._rom_keys_snapshot
+    
     def _select_wallet(
         self,
         pool_id: PoolId,
@@ -334,12 +409,29 @@ class MiningCoordinator:
                 return None
             return wallet_pool.allocate_wallet(pool_id, challenge_id)
 
-    def clear_sticky_wallet(self, worker_id: int, worker_type: WorkerType = 'cpu') -> None:
-        """Clear the sticky wallet assignment for a worker."""
-        if worker_type == 'gpu' and worker_id in self.gpu_sticky_wallets:
-            logging.debug(f"Coordinator: Clearing sticky wallet for GPU {worker_id}")
-            del self.gpu_sticky_wallets[worker_id]
-        elif worker_type == 'cpu' and worker_id in self.cpu_sticky_wallets:
+    def clear_sticky_wallet(
+        self,
+        worker_id: int,
+        worker_type: WorkerType = 'cpu',
+        slot: int = 0,
+        address: Optional[str] = None
+    ) -> None:
+        """
+        Clear the sticky wallet assignment for a worker.
+        
+        Args:
+            worker_id: Worker ID
+            worker_type: 'gpu' or 'cpu'
+            slot: GPU pipeline slot (always 0 for CPUs)
+            address: Only clear if this is still the sticky wallet, so a late
+                response can't drop a newer assignment
+        """
+        if worker_type == 'gpu':
+            sticky = self.gpu_sticky_wallets.get((worker_id, slot))
+            if sticky is not None and address in (None, sticky):
+                logging.debug("Coordinator: Clearing sticky wallet for GPU %s slot %s", worker_id, slot)
+                del self.gpu_sticky_wallets[(worker_id, slot)]
+        elif worker_id in self.cpu_sticky_wallets and address in (None, self.cpu_sticky_wallets[worker_id]):
             logging.info(f"Coordinator: Clearing sticky wallet for CPU worker {worker_id}")
             del self.cpu_sticky_wallets[worker_id]
             self.cpu_pending_dev_fee.pop(worker_id, None)
@@ -350,7 +442,8 @@ class MiningCoordinator:
         worker_id: int,
         pool_id: PoolId,
         challenge: Challenge,
-        wallet: WalletOptional
+        wallet: WalletOptional,
+        slot: int = 0
     ) -> None:
         """
         Log the start of mining if this is a new challenge/wallet combination.
@@ -361,29 +454,60 @@ class MiningCoordinator:
             pool_id: Pool identifier
             challenge: Challenge being mined
             wallet: Wallet being used
+            slot: GPU pipeline slot (always 0 for CPUs)
         """
         combo = (challenge['challenge_id'], wallet['address'])
         
-        # Use worker-specific key for tracking to avoid log spam when workers share pools
-        tracker_key = f"{worker_type}_{worker_id}"
+        # Track per worker (not per pool) to avoid log spam when workers share
+        # pools, and per pipeline slot since GPU slots alternate their wallets
+        logged_combos = self.last_logged_combos[worker_type]
+        index = worker_id * self.gpu_pipeline_depth + slot if worker_type == 'gpu' else worker_id
         
         # Only log if this is a new combination for this specific worker
-        if combo != self.last_logged_combos.get(tracker_key):
+        if combo != logged_combos[index]:
+            logged_combos[index] = combo
+            if not logging.getLogger().isEnabledFor(logging.INFO):
+                return
+            
             challenge_short = mining_utils.truncate_challenge_id(challenge['challenge_id'], 8)
             wallet_short = mining_utils.truncate_address(wallet['address'], 10)
             
             logging.info(
-                f"{worker_type.upper()} {worker_id} mining {challenge_short}... "
-                f"with wallet {wallet_short}..."
+                "%s %s mining %s... with wallet %s...",
+                worker_type.upper(), worker_id, challenge_short, wallet_short
             )
+    
+    def _next_start_nonce(self, worker_type: WorkerType, worker_id: int) -> int:
+        """
+        Get the next start nonce for a worker.
+        
+        The top 8 bits identify the worker (GPUs 0x00-0x7F, CPUs 0x80-0xFF) and
+        the low 56 bits are a per-worker counter advanced by NONCE_STRIDE per
+        job, so nonce ranges never overlap between workers or between jobs.
+        
+        Args:
+            worker_type: 'gpu' or 'cpu'
+            worker_id: Worker ID
             
-            self.last_logged_combos[tracker_key] = combo
+        Returns:
+            64-bit start nonce
+        """
+        key = (worker_type, worker_id)
+        counter = self._nonce_counters.get(key)
+        if counter is None:
+            # Random, stride-aligned seed so restarts do not replay the same ranges
+            counter = mining_utils.generate_random_nonce() & _NONCE_COUNTER_MASK & ~(NONCE_STRIDE - 1)
+        self._nonce_counters[key] = (counter + NONCE_STRIDE) & _NONCE_COUNTER_MASK
+        
+        stripe = (0x80 if worker_type == 'cpu' else 0x00) | (worker_id & 0x7F)
+        return (stripe << 56) | counter
     
     def _build_mine_request(
         self,
         req_id: int,
         wallet: WalletOptional,
         challenge: Challenge,
+        start_nonce: int,
         full_difficulty: bool = False
     ) -> MineRequest:
         """
@@ -393,6 +517,7 @@ class MiningCoordinator:
             req_id: Request ID
             wallet: Wallet to mine with
             challenge: Challenge to mine
+            start_nonce: First nonce the worker should try
             full_difficulty: If True, use full 256-bit difficulty (CPU),
                            if False, use first 32 bits (GPU)
             
@@ -404,7 +529,6 @@ class MiningCoordinator:
             challenge['difficulty'],
             full=full_difficulty
         )
-        start_nonce = mining_utils.generate_random_nonce()
         
         return {
             'id': req_id,
@@ -414,38 +538,3 @@ class MiningCoordinator:
             'difficulty': difficulty,
             'start_nonce': start_nonce
         }
-    
-    def can_dispatch_gpu(self, num_gpus: int, active_gpu_requests: int) -> bool:
-        """Check if we can dispatch more GPU jobs."""
-        return active_gpu_requests < num_gpus
-    
-    def can_dispatch_cpu(
-        self,
-        num_cpus: int,
-        active_requests: Dict[int, tuple]
-    ) -> Optional[int]:
-        """
-        Check if we can dispatch more CPU jobs and find free worker.
-        
-        Args:
-            num_cpus: Total number of CPU workers
-            active_requests: Dictionary of active requests
-            
-        Returns:
-            Free CPU worker ID if available, None otherwise
-        """
-        # Find busy CPUs
-        busy_cpus = set()
-        for req_info in active_requests.values():
-            if req_info[0] == 'cpu':
-                busy_cpus.add(req_info[1])
-        
-        if len(busy_cpus) >= num_cpus:
-            return None
-        
-        # Find first free CPU
-        for i in range(num_cpus):
-            if i not in busy_cpus:
-                return i
-        
-        return None
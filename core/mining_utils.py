@@ -5,6 +5,7 @@ Common utility functions used across mining modules to reduce code duplication.
 """
 
 import random
+from functools import lru_cache
 from typing import Tuple
 
 from .types import Challenge, WalletOptional
@@ -31,18 +32,43 @@ def build_salt_prefix(wallet: WalletOptional, challenge: Challenge) -> bytes:
         >>> len(salt) > 0
         True
     """
-    salt_prefix_str = (
-        wallet['address'] +
-        challenge['challenge_id'] +
-        challenge['difficulty'] +
-        challenge['no_pre_mine'] +
-        challenge.get('latest_submission', '') +
+    # Wallets stay pinned to a challenge across many jobs, so the whole prefix
+    # is cached per (address, challenge); the challenge part is shared as well
+    return _salt_prefix(
+        wallet['address'],
+        challenge['challenge_id'],
+        challenge['difficulty'],
+        challenge['no_pre_mine'],
+        challenge.get('latest_submission', ''),
         challenge.get('no_pre_mine_hour', '')
     )
-    
-    return salt_prefix_str.encode('utf-8')
 
 
+@lru_cache(maxsize=1024)
+def _salt_prefix(address: str, *challenge_fields: str) -> bytes:
+    """Encode the full salt prefix (cached per wallet and challenge)."""
+    return address.encode('utf-8') + _challenge_salt_suffix(*challenge_fields)
+
+
+@lru_cache(maxsize=64)
+def _challenge_salt_suffix(
+    challenge_id: str,
+    difficulty: str,
+    no_pre_mine: str,
+    latest_submission: str,
+    no_pre_mine_hour: str
+) -> bytes:
+    """Encode the challenge-dependent part of the salt prefix (cached per challenge)."""
+    return (
+        challenge_id +
+        difficulty +
+        no_pre_mine +
+        latest_submission +
+        no_pre_mine_hour
+    ).encode('utf-8')
+
+
+@lru_cache(maxsize=64)
 def parse_difficulty(difficulty_str: str, full: bool = False) -> int:
     """
     Parse difficulty from hex string.
@@ -70,6 +96,19 @@ def parse_difficulty(difficulty_str: str, full: bool = False) -> int:
         return int(clean_diff[:8], 16)
 
 
+def challenge_difficulty(challenge: Challenge) -> int:
+    """
+    Full 256-bit difficulty of a challenge, usable directly as a sort key.
+    
+    Args:
+        challenge: Challenge data
+        
+    Returns:
+        Integer difficulty value
+    """
+    return parse_difficulty(challenge['difficulty'], full=True)
+
+
 def generate_random_nonce() -> int:
     """
     Generate a random 64-bit starting nonce for mining.
@@ -160,26 +199,3 @@ def calculate_hashrate(hashes: int, duration: float) -> float:
     if duration <= 0:
         return 0.0
     return hashes / duration
-
-
-def smooth_hashrate(old_hashrate: float, new_hashrate: float, weight_old: float = 0.9) -> float:
-    """
-    Apply exponential moving average to smooth hashrate fluctuations.
-    
-    Args:
-        old_hashrate: Previous hashrate value
-        new_hashrate: New instantaneous hashrate
-        weight_old: Weight for old value (0.9 = 90% old, 10% new)
-        
-    Returns:
-        Smoothed hashrate value
-        
-    Example:
-        >>> smooth_hashrate(1000.0, 1200.0, 0.9)
-        1020.0
-    """
-    if old_hashrate == 0:
-        return new_hashrate
-    
-    weight_new = 1.0 - weight_old
-    return (weight_old * old_hashrate) + (weight_new * new_hashrate)
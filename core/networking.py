@@ -1,14 +1,17 @@
 import requests
 import time
+import heapq
+import itertools
 import logging
 import threading
 import queue
-from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, Tuple, List
 
 from .config import config
 from .constants import (
     SOLUTION_RETRY_EXPIRY_HOURS,
+    SOLUTION_RESUBMIT_BASE_DELAY,
+    SOLUTION_RESUBMIT_MAX_DELAY,
     API_MAX_RETRIES,
     API_RETRY_BACKOFF_BASE,
     API_REQUEST_TIMEOUT,
@@ -35,7 +38,7 @@ class SolutionSubmissionQueue:
             api_client: Reference to parent APIClient instance
         """
         self.api_client: APIClient = api_client
-        self.queue: queue.Queue = queue.Queue()
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
         self.running: bool = False
         self.thread: Optional[threading.Thread] = None
         self.retry_hours: int = config.get("api.solution_retry_hours", SOLUTION_RETRY_EXPIRY_HOURS)
@@ -70,7 +73,7 @@ class SolutionSubmissionQueue:
             'wallet_address': wallet_address,
             'challenge_id': challenge_id,
             'nonce': nonce,
-            'created_at': datetime.now(),
+            'created_at': time.monotonic(),
             'attempts': 0
         }
         self.queue.put(submission)
@@ -82,25 +85,38 @@ class SolutionSubmissionQueue:
         
         Continuously processes queued solutions, retrying failed submissions with
         exponential backoff. Discards solutions that are too old or have fatal errors.
+        Pending submissions are kept in a heap ordered by next attempt time, so
+        each pass only touches the ones that are due.
         """
-        retry_queue: list[Dict[str, Any]] = []
+        # Entries are (next_attempt_at, seq, submission); seq keeps ordering
+        # FIFO among equal times and avoids comparing the dicts
+        pending: list[tuple[float, int, Dict[str, Any]]] = []
+        seq = itertools.count()
+        max_age = self.retry_hours * 3600
         
         while self.running:
             try:
-                # Check for new submissions (non-blocking with timeout)
+                # Sleep until new work arrives or the earliest retry is due
+                timeout = 1.0
+                if pending:
+                    timeout = min(timeout, max(0.0, pending[0][0] - time.monotonic()))
+                
+                # Drain everything already queued
                 try:
-                    submission = self.queue.get(timeout=1)
-                    retry_queue.append(submission)
+                    submission = self.queue.get(timeout=timeout)
+                    while True:
+                        heapq.heappush(pending, (submission['created_at'], next(seq), submission))
+                        submission = self.queue.get_nowait()
                 except queue.Empty:
                     pass
                 
-                # Process retry queue
-                still_retrying: list[Dict[str, Any]] = []
-                for submission in retry_queue:
-                    age = datetime.now() - submission['created_at']
+                # Process submissions that are due
+                now = time.monotonic()
+                while pending and pending[0][0] <= now:
+                    _, _, submission = heapq.heappop(pending)
                     
                     # Check if solution has expired
-                    if age > timedelta(hours=self.retry_hours):
+                    if now - submission['created_at'] > max_age:
                         logging.warning(
                             f"Solution expired after {self.retry_hours}h, discarding: "
                             f"{submission['challenge_id'][:8]}... nonce={submission['nonce']}"
@@ -126,20 +142,16 @@ class SolutionSubmissionQueue:
                             f"nonce={submission['nonce']}"
                         )
                     else:
-                        # Transient error, retry later with fixed 5-minute interval
-                        retry_delay = 300  # 5 minutes
+                        # Transient error, retry later with exponential backoff
+                        retry_delay = min(
+                            SOLUTION_RESUBMIT_MAX_DELAY,
+                            SOLUTION_RESUBMIT_BASE_DELAY * 2 ** (submission['attempts'] - 1)
+                        )
                         logging.debug(
                             f"Solution submission failed (attempt {submission['attempts']}), "
                             f"will retry in {retry_delay}s"
                         )
-                        # Add wait time to creation time to delay next attempt
-                        submission['created_at'] = datetime.now() - age + timedelta(seconds=retry_delay)
-                        still_retrying.append(submission)
-                
-                retry_queue = still_retrying
-                
-                # Brief sleep to prevent tight loop
-                time.sleep(0.1)
+                        heapq.heappush(pending, (time.monotonic() + retry_delay, next(seq), submission))
                 
             except Exception as e:
                 logging.error(f"Error in solution submission queue: {e}")
@@ -6,17 +6,51 @@ solution submission, wallet management, and hashrate calculations.
 """
 
 import logging
+import threading
+from collections import Counter, deque
 from typing import Dict, Optional
 
 from .database import db
 from .networking import api
 from .wallet_pool import wallet_pool
-from .constants import HASHRATE_EMA_WEIGHT_OLD, HASHRATE_EMA_WEIGHT_NEW
+from .constants import HASHRATE_WINDOW_SAMPLES
 from .types import MineResponse, Challenge, WorkerType, PoolId
 from . import mining_utils
 
 
 
+class HashrateWindow:
+    """
+    Hashrate over the last few worker responses.
+    
+    Keeps running totals of hashes and busy time so that adding a sample and
+    reading the rate are both O(1). Unlike an EMA, a single large batch cannot
+    skew the figure for longer than the window.
+    """
+    
+    __slots__ = ('_samples', '_hashes', '_duration')
+    
+    def __init__(self, size: int = HASHRATE_WINDOW_SAMPLES) -> None:
+        self._samples: deque = deque(maxlen=size)
+        self._hashes = 0
+        self._duration = 0.0
+    
+    def add(self, hashes: int, duration: float) -> None:
+        """Record one response, evicting the oldest sample when full."""
+        if len(self._samples) == self._samples.maxlen:
+            old_hashes, old_duration = self._samples[0]
+            self._hashes -= old_hashes
+            self._duration -= old_duration
+        self._samples.append((hashes, duration))
+        self._hashes += hashes
+        self._duration += duration
+    
+    @property
+    def rate(self) -> float:
+        """Hashes per second of busy time across the window."""
+        return mining_utils.calculate_hashrate(self._hashes, self._duration)
+
+
 class ResponseProcessor:
     """
     Processes mining responses from workers and manages solution submission.
@@ -24,17 +58,33 @@ class ResponseProcessor:
     Handles:
     - Solution validation and submission
     - Wallet pool management (allocation/release)
-    - Hashrate calculation and smoothing
+    - Hashrate calculation over a sliding window
     - Statistics tracking
     """
     
+    __slots__ = (
+        'gpu_hashrates', 'cpu_hashrate', '_gpu_windows', '_cpu_window',
+        'session_solutions', 'dev_session_solutions', 'wallet_session_solutions',
+        '_stats_lock', '_hashrate_updaters'
+    )
+    
     def __init__(self) -> None:
         """Initialize response processor with default stats."""
         self.gpu_hashrates: Dict[int, float] = {} # Map worker_id -> hashrate
         self.cpu_hashrate = 0.0
+        self._gpu_windows: Dict[int, HashrateWindow] = {}
+        self._cpu_window = HashrateWindow()
         self.session_solutions = 0
         self.dev_session_solutions = 0
-        self.wallet_session_solutions: Dict[str, int] = {}
+        self.wallet_session_solutions: Counter[str] = Counter()
+        # Counters are bumped from the manager and retry threads and read by
+        # the dashboard thread, so all access goes through this lock
+        self._stats_lock = threading.Lock()
+        # Per-type hashrate update, bound once instead of branching per response
+        self._hashrate_updaters = {
+            'gpu': self._update_gpu_hashrate,
+            'cpu': self._update_cpu_hashrate,
+        }
 
     
     def process_response(
@@ -86,16 +136,11 @@ class ResponseProcessor:
                 is_dev_solution=is_dev_solution,
                 current_challenge=current_challenge
             )
-        else:
+        elif is_dev_solution or not keep_wallet_on_fail:
             # No solution found - release wallet
-            if is_dev_solution:
-                # BUG FIX: Release dev wallets too, they were getting stuck!
-                wallet_pool.release_wallet(pool_id, wallet_address, challenge_id, solved=False)
-            elif not keep_wallet_on_fail:
-                wallet_pool.release_wallet(pool_id, wallet_address, challenge_id, solved=False)
-            else:
-                # Sticky wallet: Don't release, so it stays "in_use" for this worker
-                pass
+            # BUG FIX: Release dev wallets too, they were getting stuck!
+            # (Sticky user wallets are kept "in_use" for their worker instead)
+            wallet_pool.release_wallet(pool_id, wallet_address, challenge_id, solved=False)
         
         # Update hashrate
         self._update_hashrate(response, worker_type, worker_id, num_workers)
@@ -169,25 +214,32 @@ class ResponseProcessor:
             logging.info("✓ Solution submitted successfully!")
         wallet_pool.release_wallet(pool_id, wallet_address, challenge_id, solved=True)
         
-        # Update database
-        db.mark_challenge_solved(wallet_address, challenge_id)
-        db.add_solution(
+        # Update database (solved marker, solution record and totals in one update)
+        db.record_accepted_solution(
             challenge_id,
             nonce_hex,
             wallet_address,
             current_challenge['difficulty'],
             is_dev_solution=is_dev_solution
         )
-        db.update_solution_status(challenge_id, nonce_hex, 'accepted')
         
         # Update session stats
-        if is_dev_solution:
-            self.dev_session_solutions += 1
-        else:
-            self.session_solutions += 1
-            if wallet_address not in self.wallet_session_solutions:
-                self.wallet_session_solutions[wallet_address] = 0
-            self.wallet_session_solutions[wallet_address] += 1
+        self.record_solution(wallet_address, is_dev_solution)
+    
+    def record_solution(self, wallet_address: str, is_dev_solution: bool) -> None:
+        """
+        Count an accepted solution in the session stats.
+        
+        Args:
+            wallet_address: Wallet that found the solution
+            is_dev_solution: Whether this is a dev fee solution
+        """
+        with self._stats_lock:
+            if is_dev_solution:
+                self.dev_session_solutions += 1
+            else:
+                self.session_solutions += 1
+                self.wallet_session_solutions[wallet_address] += 1
     
     def _handle_failed_submission(
         self,
@@ -229,35 +281,29 @@ class ResponseProcessor:
         num_workers: int
     ) -> None:
         """Update hashrate estimates based on worker response."""
-        if not response.get('hashes') or not response.get('duration'):
+        hashes = response.get('hashes')
+        duration = response.get('duration')
+        if not hashes or not duration or duration <= 0:
             return
         
-        hashes = response['hashes']
-        duration = response['duration']
-        
-        if duration <= 0:
-            return
-        
-        instant_hashrate = mining_utils.calculate_hashrate(hashes, duration)
-        
-        if worker_type == 'gpu':
-            # For GPU, we track per-worker hashrate
-            current_val = self.gpu_hashrates.get(worker_id, 0.0)
-            self.gpu_hashrates[worker_id] = mining_utils.smooth_hashrate(
-                current_val,
-                instant_hashrate,
-                HASHRATE_EMA_WEIGHT_OLD
-            )
-        elif worker_type == 'cpu':
-            # For CPU, we track total hashrate (since workers are threads)
-            # We approximate total by multiplying instant by num_workers, but this is noisy
-            # Better: Just smooth the instant * num_workers as a rough total estimate
-            total_estimate = instant_hashrate * num_workers
-            self.cpu_hashrate = mining_utils.smooth_hashrate(
-                self.cpu_hashrate,
-                total_estimate,
-                HASHRATE_EMA_WEIGHT_OLD
-            )
+        updater = self._hashrate_updaters.get(worker_type)
+        if updater is not None:
+            updater(worker_id, hashes, duration, num_workers)
+    
+    def _update_gpu_hashrate(self, worker_id: int, hashes: int, duration: float, num_workers: int) -> None:
+        """Update the hashrate of a single GPU (tracked per device)."""
+        window = self._gpu_windows.get(worker_id)
+        if window is None:
+            window = self._gpu_windows[worker_id] = HashrateWindow()
+        window.add(hashes, duration)
+        self.gpu_hashrates[worker_id] = window.rate
+    
+    def _update_cpu_hashrate(self, worker_id: int, hashes: int, duration: float, num_workers: int) -> None:
+        """Update the combined CPU hashrate."""
+        # CPU workers share one window; they run concurrently, so the
+        # per-worker rate scales by the worker count for the total
+        self._cpu_window.add(hashes, duration)
+        self.cpu_hashrate = self._cpu_window.rate * num_workers
     
     def get_total_hashrate(self) -> float:
         """Get combined GPU + CPU hashrate."""
@@ -271,12 +317,17 @@ class ResponseProcessor:
         Returns:
             Dictionary with hashrate and solution counts
         """
+        with self._stats_lock:
+            session_solutions = self.session_solutions
+            dev_session_solutions = self.dev_session_solutions
+            wallet_solutions = dict(self.wallet_session_solutions)
+        
         return {
             'gpu_hashrates': self.gpu_hashrates.copy(), # Return dict of per-GPU hashrates
             'gpu_hashrate': sum(self.gpu_hashrates.values()), # Total GPU hashrate for backward compat
             'cpu_hashrate': self.cpu_hashrate,
             'total_hashrate': self.get_total_hashrate(),
-            'session_solutions': self.session_solutions,
-            'dev_session_solutions': self.dev_session_solutions,
-            'wallet_solutions': self.wallet_session_solutions.copy()
+            'session_solutions': session_solutions,
+            'dev_session_solutions': dev_session_solutions,
+            'wallet_solutions': wallet_solutions
         }
@@ -7,7 +7,8 @@ retries and persistent retries from database.
 
 import time
 import logging
-from typing import List, Tuple, Optional
+from collections import deque
+from typing import Deque, Dict, Tuple
 
 from .database import db
 from .networking import api
@@ -24,9 +25,29 @@ class RetryManager:
     
     def __init__(self) -> None:
         """Initialize retry manager with empty immediate queue."""
-        self.immediate_queue: List[Tuple[str, str, str, str, bool, int]] = []
+        # Producers may run on other threads; the mining loop is the only consumer.
+        # No lock is needed: deque.append/popleft and dict.setdefault/pop are
+        # each atomic, and the key map is claimed before the item is queued.
+        self.immediate_queue: Deque[RetryQueueItem] = deque()
+        self._queued_keys: Dict[Tuple[str, str], RetryQueueItem] = {}  # (challenge_id, nonce) -> item
         self.last_persistent_check = 0
     
+    def _enqueue(self, item: RetryQueueItem) -> bool:
+        """
+        Append an item to the immediate queue unless it is already queued.
+        
+        Returns:
+            True if the item was added
+        """
+        if self._queued_keys.setdefault((item.challenge_id, item.nonce), item) is not item:
+            return False  # Already queued
+        self.immediate_queue.append(item)
+        return True
+    
+    def has_pending(self) -> bool:
+        """Check whether any retries are queued or persisted."""
+        return bool(self.immediate_queue) or db.has_failed_solutions()
+    
     def add_to_queue(
         self,
         wallet_address: str,
@@ -47,7 +68,7 @@ class RetryManager:
             is_dev_solution: Whether this is a dev fee solution
             retry_count: Current retry attempt count
         """
-        self.immediate_queue.append((
+        self._enqueue(RetryQueueItem(
             wallet_address,
             challenge_id,
             nonce,
@@ -56,8 +77,10 @@ class RetryManager:
             retry_count
         ))
         logging.debug(
-            f"Added to retry queue: {challenge_id[:8]}... "
-            f"(attempt {retry_count + 1}/{MAX_IMMEDIATE_RETRIES})"
+            "Added to retry queue: %s... (attempt %d/%d)",
+            challenge_id[:8],
+            retry_count + 1,
+            MAX_IMMEDIATE_RETRIES
         )
     
     def process_immediate_retries(
@@ -78,11 +101,12 @@ class RetryManager:
         Returns:
             Number of solutions successfully resubmitted
         """
-        if not self.immediate_queue:
-            return 0
-        
         # Process one retry per call to avoid blocking
-        retry_item = self.immediate_queue.pop(0)
+        try:
+            retry_item = self.immediate_queue.popleft()
+        except IndexError:
+            return 0
+        self._queued_keys.pop((retry_item.challenge_id, retry_item.nonce), None)
         wallet_addr, challenge_id, nonce, difficulty, is_dev, retry_count = retry_item
         
         logging.info(
@@ -110,7 +134,7 @@ class RetryManager:
             # Transient error - re-queue if not at max retries
             if retry_count < MAX_IMMEDIATE_RETRIES - 1:
                 new_count = retry_count + 1
-                self.immediate_queue.append((
+                self._enqueue(RetryQueueItem(
                     wallet_addr, challenge_id, nonce, difficulty, is_dev, new_count
                 ))
                 logging.warning(f"Retry failed (transient). Re-queueing ({new_count + 1}/{MAX_IMMEDIATE_RETRIES})")
@@ -133,28 +157,24 @@ class RetryManager:
             Number of retries loaded from database
         """
         # Only check periodically to avoid database overhead
-        if req_id % RETRY_CHECK_FREQUENCY != 0:
+        if req_id % RETRY_CHECK_FREQUENCY != 0 or not db.has_failed_solutions():
             return 0
         
         pending_retries = db.get_pending_retries()
         loaded_count = 0
         
         for retry_item in pending_retries:
-            # Check if already in queue
-            in_queue = any(
-                item[1] == retry_item['challenge_id'] and item[2] == retry_item['nonce']
-                for item in self.immediate_queue
-            )
+            # Skipped if already in queue
+            added = self._enqueue(RetryQueueItem(
+                retry_item['wallet_address'],
+                retry_item['challenge_id'],
+                retry_item['nonce'],
+                retry_item['difficulty'],
+                retry_item['is_dev_solution'],
+                retry_item.get('retry_count', 0)
+            ))
             
-            if not in_queue:
-                self.immediate_queue.append((
-                    retry_item['wallet_address'],
-                    retry_item['challenge_id'],
-                    retry_item['nonce'],
-                    retry_item['difficulty'],
-                    retry_item['is_dev_solution'],
-                    retry_item.get('retry_count', 0)
-                ))
+            if added:
                 loaded_count += 1
                 logging.info(
                     f"Loaded pending retry from DB: "
@@ -174,5 +194,6 @@ class RetryManager:
         """Clear the immediate retry queue (use with caution)."""
         cleared = len(self.immediate_queue)
         self.immediate_queue.clear()
+        self._queued_keys.clear()
         if cleared > 0:
             logging.warning(f"Cleared {cleared} items from retry queue")
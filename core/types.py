@@ -5,7 +5,7 @@ Centralized type definitions for the GPU Miner application.
 Uses TypedDict for runtime type checking and better IDE support.
 """
 
-from typing import TypedDict, Union, Optional, Literal
+from typing import TypedDict, NamedTuple, Union, Optional, Literal
 
 
 # ============================================================================
@@ -86,25 +86,14 @@ class MineResponse(TypedDict, total=False):
     error: Optional[str]
 
 
-class ActiveGPURequest(TypedDict):
-    """Active GPU mining request tracking."""
-    type: Literal["gpu"]
+class ActiveRequest(NamedTuple):
+    """In-flight mining request tracking (a plain tuple underneath)."""
+    worker_type: "WorkerType"
     worker_id: int
     wallet_address: str
     challenge_id: str
     is_dev_solution: bool
-
-
-class ActiveCPURequest(TypedDict):
-    """Active CPU mining request tracking."""
-    type: Literal["cpu"]
-    worker_id: int
-    wallet_address: str
-    challenge_id: str
-    is_dev_solution: bool
-
-
-ActiveRequest = Union[ActiveGPURequest, ActiveCPURequest]
+    slot: int  # GPU pipeline slot (always 0 for CPUs)
 
 
 # ============================================================================
@@ -134,8 +123,8 @@ class FailedSolution(TypedDict):
     last_retry: Optional[str]
 
 
-class RetryQueueItem(TypedDict):
-    """Item in the immediate retry queue."""
+class RetryQueueItem(NamedTuple):
+    """Item in the immediate retry queue (a plain tuple underneath)."""
     wallet_address: str
     challenge_id: str
     nonce: str
@@ -12,7 +12,7 @@ import time
 from datetime import datetime
 from pathlib import Path
 from filelock import FileLock
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Sequence, Tuple
 
 from .config import config
 from .types import WalletOptional, PoolId
@@ -28,6 +28,7 @@ class WalletPool:
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self._locks: Dict[PoolId, threading.Lock] = {}
         self._file_locks: Dict[PoolId, FileLock] = {}
+        self._registry_lock = threading.Lock()  # Guards lazy creation of per-pool locks
         self._consolidation_threads: Dict[PoolId, threading.Thread] = {}
         self._stop_consolidation = threading.Event()
     
@@ -76,16 +77,18 @@ class WalletPool:
     
     def _get_thread_lock(self, pool_id: PoolId) -> threading.Lock:
         """Get or create a thread lock for a pool."""
-        if pool_id not in self._locks:
-            self._locks[pool_id] = threading.Lock()
-        return self._locks[pool_id]
+        with self._registry_lock:
+            if pool_id not in self._locks:
+                self._locks[pool_id] = threading.Lock()
+            return self._locks[pool_id]
     
     def _get_file_lock(self, pool_id: PoolId) -> FileLock:
         """Get or create a file lock for a pool."""
-        if pool_id not in self._file_locks:
-            lock_path = self._get_lock_path(pool_id)
-            self._file_locks[pool_id] = FileLock(str(lock_path), timeout=10)
-        return self._file_locks[pool_id]
+        with self._registry_lock:
+            if pool_id not in self._file_locks:
+                lock_path = self._get_lock_path(pool_id)
+                self._file_locks[pool_id] = FileLock(str(lock_path), timeout=10)
+            return self._file_locks[pool_id]
     
     def _load_pool(self, pool_id: PoolId) -> Dict:
         """Load wallet pool from JSON file."""
@@ -293,6 +296,32 @@ class WalletPool:
         Allocate an available wallet for a pool to mine a specific challenge.
         Optionally filters by dev wallet flag.
         """
+        allocated = self.allocate_wallet_any(pool_id, (challenge_id,), require_dev)
+        return allocated[0] if allocated else None
+    
+    def allocate_wallet_any(
+        self,
+        pool_id: PoolId,
+        challenge_ids: Sequence[str],
+        require_dev: bool = False
+    ) -> Optional[Tuple[WalletOptional, str]]:
+        """
+        Allocate an available wallet for the first challenge that has one.
+        
+        Challenges are tried in the given order under a single lock and pool
+        load, so callers can search many challenges for one allocation.
+        
+        Args:
+            pool_id: Pool ID (GPU ID or CPU ID)
+            challenge_ids: Candidate challenge IDs, in order of preference
+            require_dev: Allocate a dev wallet instead of a user wallet
+            
+        Returns:
+            Tuple of (wallet, challenge_id) or None if no wallet is available
+        """
+        if not challenge_ids:
+            return None
+        
         thread_lock = self._get_thread_lock(pool_id)
         file_lock = self._get_file_lock(pool_id)
         
@@ -300,39 +329,38 @@ class WalletPool:
             with file_lock:
                 pool = self._load_pool(pool_id)
                 
-                # Find an available wallet not currently solving this challenge
-                for wallet in pool.get("wallets", []):
-                    is_dev_wallet = wallet.get("is_dev_wallet", False)
-                    if require_dev and not is_dev_wallet:
-                        continue
-                    if not require_dev and is_dev_wallet:
-                        continue
-                    
-                    # Check if in use
-                    in_use = wallet.get("in_use", False)
-                    if in_use:
-                        continue
-                    
-                    # BUG FIX: Treat dev wallets the same as user wallets
-                    # Only skip if already solved THIS SPECIFIC challenge or in use
-                    # This allows dev wallet reuse across different challenges
-                    
-                    # MULTI-CHALLENGE FIX: Support challenge_id="any" for wallet selection without challenge filter
-                    if challenge_id != "any":
-                        solved_challenges = wallet.get("solved_challenges", [])
-                        if challenge_id in solved_challenges:
-                            # logging.debug(f"Skipping wallet {wallet['address'][:8]} (Already solved {challenge_id[:8]})")
+                # BUG FIX: Treat dev wallets the same as user wallets
+                # Only skip if already solved THIS SPECIFIC challenge or in use
+                # This allows dev wallet reuse across different challenges
+                # Each free wallet's solved list is indexed as a set once, so
+                # every candidate challenge is a single hash probe per wallet
+                free_wallets = [
+                    (wallet, frozenset(wallet.get("solved_challenges", ())))
+                    for wallet in pool.get("wallets", [])
+                    if bool(wallet.get("is_dev_wallet", False)) == require_dev
+                    and not wallet.get("in_use", False)
+                ]
+                if not free_wallets:
+                    return None
+                
+                for challenge_id in challenge_ids:
+                    # Find an available wallet not currently solving this challenge
+                    for wallet, solved_challenges in free_wallets:
+                        # MULTI-CHALLENGE FIX: Support challenge_id="any" for wallet selection without challenge filter
+                        if challenge_id != "any" and challenge_id in solved_challenges:
                             continue
-                    
-                    # Mark as in use
-                    wallet["in_use"] = True
-                    wallet["current_challenge"] = challenge_id
-                    wallet["allocated_at"] = datetime.now().isoformat()
-                    
-                    self._save_pool(pool_id, pool)
-                    wallet_label = "DEV" if is_dev_wallet else "USER"
-                    logging.debug(f"Allocated {wallet_label} wallet {wallet['address'][:8]} for {challenge_id[:8]}")
-                    return wallet
+                        
+                        # Mark as in use
+                        wallet["in_use"] = True
+                        wallet["current_challenge"] = challenge_id
+                        wallet["allocated_at"] = datetime.now().isoformat()
+                        
+                        self._save_pool(pool_id, pool)
+                        logging.debug(
+                            "Allocated %s wallet %s for %s",
+                            "DEV" if require_dev else "USER", wallet['address'][:8], challenge_id[:8]
+                        )
+                        return (wallet, challenge_id)
                 
                 return None
     
@@ -383,7 +411,7 @@ class WalletPool:
                         if solved:
                             logging.info(f"Released wallet {address[:8]}... (Solved: {challenge_id[:8]}...)")
                         else:
-                            logging.debug(f"Released wallet {address[:8]}... (Not solved)")
+                            logging.debug("Released wallet %s... (Not solved)", address[:8])
                         return
                 
                 logging.warning(f"release_wallet: Wallet {address} not found in pool {pool_id}")
@@ -1,7 +1,6 @@
 import multiprocessing as mp
 import time
 import logging
-import queue
 import traceback
 import sys
 import os
@@ -66,10 +65,9 @@ class CPUWorker(mp.Process):
         rom_cache = {}
 
         while not self.shutdown_event.is_set():
-            try:
-                req = self.request_queue.get(timeout=1.0)
-            except queue.Empty:
-                continue
+            # Blocks until the manager sends a job or a shutdown request; the
+            # manager also sets shutdown_event so a running batch stops early
+            req = self.request_queue.get()
 
             if req.get('type') == 'shutdown':
                 self.logger.info("Shutdown request received")
@@ -118,7 +116,7 @@ class CPUWorker(mp.Process):
             # Increased to 5000 to improve CPU utilization and reduce overhead
             loop_batch = 5000
             
-            start_time = time.time()
+            start_time = time.perf_counter()  # Monotonic, high-resolution clock for durations
             
             # Log before starting to confirm we reach the mining loop
             #self.logger.info(f"CPU Worker {self.worker_id}: Starting batch of {loop_batch} hashes, start_nonce={start_nonce}")
@@ -157,7 +155,7 @@ class CPUWorker(mp.Process):
                         'nonce': current_nonce,
                         'hash': digest_hex,
                         'hashes': i + 1,
-                        'duration': time.time() - start_time
+                        'duration': time.perf_counter() - start_time
                     })
                     return
 
@@ -170,7 +168,7 @@ class CPUWorker(mp.Process):
                 'nonce': None,
                 'hash': None,
                 'hashes': actual_hashes,
-                'duration': time.time() - start_time
+                'duration': time.perf_counter() - start_time
             })
 
         except Exception as e:
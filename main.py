@@ -21,10 +21,17 @@ from core.miner_manager import MinerManager
 def _init_multiprocessing():
     """Initialize multiprocessing with appropriate settings."""
     import multiprocessing as mp
-    # Explicitly set spawn mode for consistency across platforms
-    # This is the default on Windows but not on Linux/Mac
+    # Prefer forkserver where supported: the server imports the worker modules
+    # once, so each GPU/CPU process forks from a small pre-warmed interpreter
+    # instead of re-importing everything like spawn does.
+    # CUDA is not initialised in the server (engines import pycuda lazily),
+    # so forked workers still create their own contexts safely.
+    # Windows only supports spawn.
+    start_method = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
     try:
-        mp.set_start_method('spawn', force=False)
+        mp.set_start_method(start_method, force=False)
+        if start_method == 'forkserver':
+            mp.set_forkserver_preload(['gpu_core', 'cpu_core.worker'])
     except RuntimeError:
         # Already set, ignore
         pass
@@ -0,0 +1,47 @@
+"""Tests for MinerManager job dispatch."""
+
+from unittest import mock
+
+import pytest
+
+# miner_manager imports the GPU engine at module level
+pytest.importorskip("gpu_core.engine")
+
+from core import miner_manager as mm
+from core.miner_manager import MinerManager
+
+
+def _make_manager(dispatch_job):
+    """Build a running MinerManager with only the dispatch collaborators set."""
+    manager = MinerManager.__new__(MinerManager)
+    manager.running = True
+    manager.mining_coordinator = mock.Mock()
+    manager.mining_coordinator.dispatch_job.side_effect = dispatch_job
+    return manager
+
+
+def test_failed_dispatch_does_not_starve_other_gpus():
+    """A GPU whose wallet pool can't supply a wallet must not block the next GPU."""
+    def dispatch_job(worker_type, worker_id, **kwargs):
+        if worker_id == 0:
+            return None  # GPU 0's pool is exhausted
+        return ({'address': 'addr1'}, 'challenge', False)
+
+    manager = _make_manager(dispatch_job)
+    free_workers = {'gpu': 0b11}
+    busy_slots = [0, 0]
+    active_requests = {}
+
+    with mock.patch.object(mm.dev_fee_manager, 'should_use_dev_wallet', return_value=False):
+        req_id = manager._dispatch_free_workers(
+            'gpu', free_workers, busy_slots, 0b1, active_requests,
+            valid_challenges=[{'challenge_id': 'challenge'}],
+            cached_rom_keys=frozenset(),
+            req_id=0
+        )
+
+    assert [r.worker_id for r in active_requests.values()] == [1]
+    assert busy_slots == [0, 1]
+    # GPU 0 stays free so it is retried on the next tick; GPU 1 is full
+    assert free_workers['gpu'] == 0b01
+    assert req_id == 2